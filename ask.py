@@ -3,6 +3,10 @@ import sys
 
 from cabinet import Cabinet
 from cabinet.models import load_available_models
+from cabinet.catalog import ModelCatalog
+from cabinet.scheduler import get_scheduler
+from cabinet.history import RunHistory
+from cabinet.answer_cache import AnswerCache
 
 
 def pick_decider_model(allowed: list[str]) -> str:
@@ -62,11 +66,27 @@ def main(argv: list[str] | None = None) -> int:
         "microsoft/phi-3.5-mini-128k-instruct",
     ]
 
+    # Drop models the endpoint does not serve before anything is routed to them (cached on disk).
+    catalog = None
+    if os.environ.get("CABINET_CHECK_MODELS", "0").lower() in ("1", "true", "yes", "on"):
+        catalog = ModelCatalog()
+        catalog.refresh(available_models)
+        available_models = catalog.filter(available_models) or available_models
+
     default_model = os.environ.get("CABINET_MODEL", "gpt-4o-mini")
     decider_model = os.environ.get("CABINET_DECIDER_MODEL", pick_decider_model(available_models))
     routing_goal = os.environ.get("CABINET_ROUTING_GOAL", "balanced")
 
     max_workers = int(os.environ.get("CABINET_MAX_WORKERS", "2"))
+    coalesce = os.environ.get("CABINET_COALESCE_STEPS", "0").lower() in ("1", "true", "yes", "on")
+    section_critique = os.environ.get("CABINET_SECTION_CRITIQUE", "0").lower() in ("1", "true", "yes", "on")
+    adaptive = os.environ.get("CABINET_ADAPTIVE_CONCURRENCY", "0").lower() in ("1", "true", "yes", "on")
+    use_scheduler = os.environ.get("CABINET_SCHEDULER", "0").lower() in ("1", "true", "yes", "on")
+    progressive = os.environ.get("CABINET_PROGRESSIVE", "0").lower() in ("1", "true", "yes", "on")
+    record_history = os.environ.get("CABINET_HISTORY", "0").lower() in ("1", "true", "yes", "on")
+    use_answer_cache = os.environ.get("CABINET_USE_ANSWER_CACHE", "0").lower() in ("1", "true", "yes", "on")
+    seconds_per_point = os.environ.get("CABINET_CRITIQUE_SECONDS_PER_POINT")
+    speculative = os.environ.get("CABINET_SPECULATIVE")
 
     cabinet = Cabinet(
         default_model=default_model,
@@ -74,6 +94,20 @@ def main(argv: list[str] | None = None) -> int:
         decider_model=decider_model,
         routing_goal=routing_goal,
         max_workers=max_workers,
+        progressive_synthesis=progressive,
+        coalesce_steps=coalesce,
+        section_critique=section_critique,
+        catalog=catalog,
+        adaptive_concurrency=adaptive,
+        scheduler=get_scheduler() if use_scheduler else None,
+        tenant=os.environ.get("CABINET_TENANT") or None,
+        priority=os.environ.get("CABINET_PRIORITY", "interactive"),
+        history=RunHistory() if record_history else None,
+        answer_cache=AnswerCache() if use_answer_cache else None,
+        critique_min_gain=float(os.environ.get("CABINET_CRITIQUE_MIN_GAIN", "0.5")),
+        critique_seconds_per_point=float(seconds_per_point) if seconds_per_point else None,
+        speculative_fraction=float(speculative) if speculative else None,
+        speculative_deadline=float(os.environ.get("CABINET_SPECULATIVE_DEADLINE", "5")),
     )
 
     parallel_env = os.environ.get("CABINET_PARALLEL", "0").lower()
@@ -93,9 +127,14 @@ def main(argv: list[str] | None = None) -> int:
         if result.critique:
             print("\nCritique:")
             print(result.critique)
-        print(f"Iterations: {result.iterations}")
+        print(f"Iterations: {result.iterations} (critique stopped: {result.stop_reason or 'n/a'})")
+        if cabinet.concurrency_limit is not None:
+            print(f"Concurrency limit: {cabinet.concurrency_limit}")
 
     print(result.final_answer)
+    if cabinet.answer_cache is not None:
+        # Inserts are written by a background thread; wait for them before exiting.
+        cabinet.answer_cache.close()
     return 0
 
 
@@ -0,0 +1,121 @@
+"""Micro-benchmark: request payload build time and allocations per LLM call.
+
+Simulates the critique phase of one query (whole-answer critiques and section
+reviews, all sharing one large team context) and builds each request body two
+ways:
+
+- inline: team context pasted into every prompt, body from json.dumps of the
+  whole payload (what requests does for json=)
+- shared: QueryPrompts templates with the context as one shared message, body
+  from encode_payload reusing that message's encoding for the whole query
+
+Usage: python benchmarks/prompt_payload.py [--context-kb 300] [--calls 8] [--rounds 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from typing import Iterator
+
+sys.path.append(".")
+
+from cabinet.agents.base import _normalize_history
+from cabinet.agents.specialists import CRITIC_SYSTEM
+from cabinet.api_client import encode_payload
+from cabinet.prompts import QueryPrompts
+
+
+QUERY = "Design a pipeline to classify support tickets by intent and urgency, with an evaluation plan."
+OPTIONS = {"temperature": 0.0, "max_tokens": 600, "response_format": {"type": "json_object"}}
+
+
+def _text(kb: int, word: str) -> str:
+    line = f"[{word}] Ticket routing notes — intent, urgency, SLA tiers, \"escalation\" paths.\n"
+    return line * max(1, (kb * 1024) // len(line))
+
+
+def inline_bodies(context_text: str, answer: str, sections: list, calls: int) -> Iterator[bytes]:
+    for i in range(calls):
+        if i % 2 == 0:
+            prompt = f"User request: {QUERY}\n\nProposed final answer:\n{answer}\n\nTeam context:\n{context_text}"
+        else:
+            section = sections[i % len(sections)]
+            prompt = (
+                f"User request: {QUERY}\n\n"
+                f"Review only section {i % len(sections) + 1} of {len(sections)} of the proposed final answer:\n"
+                f"{section}\n\nTeam context:\n{context_text}"
+            )
+        messages = [{"role": "system", "content": CRITIC_SYSTEM}, {"role": "user", "content": prompt}]
+        payload = {"model": "gpt-4o-mini", "messages": messages, **OPTIONS}
+        yield json.dumps(payload, allow_nan=False).encode("utf-8")
+
+
+def shared_bodies(context_text: str, answer: str, sections: list, calls: int) -> Iterator[bytes]:
+    prompts = QueryPrompts(QUERY)
+    team_context = prompts.with_context(context_text)
+    for i in range(calls):
+        if i % 2 == 0:
+            prompt = prompts.critique(answer)
+        else:
+            prompt = prompts.section_critique(sections[i % len(sections)], i % len(sections), len(sections))
+        messages = _normalize_history(CRITIC_SYSTEM, team_context, prompt)
+        yield encode_payload("gpt-4o-mini", messages, **OPTIONS)
+
+
+def measure(fn, args, rounds: int) -> dict:
+    calls = args[-1]
+    started = time.perf_counter()
+    for _ in range(rounds):
+        # Each round is a fresh query with its own QueryPrompts, so nothing is encoded up front.
+        for _body in fn(*args):
+            pass
+    elapsed = time.perf_counter() - started
+
+    # Allocation high-water mark while building each body (the body itself included).
+    peaks = []
+    size = 0
+    tracemalloc.start()
+    bodies = fn(*args)
+    while True:
+        base, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        body = next(bodies, None)
+        if body is None:
+            break
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - base)
+        size += len(body)
+        del body
+    tracemalloc.stop()
+    return {
+        "ms_per_call": elapsed * 1000.0 / (rounds * calls),
+        "alloc_kb_per_call": sum(peaks) / 1024.0 / len(peaks),
+        "body_kb": size / 1024.0 / len(peaks),
+    }
+
+
+def main(argv=None) -> int:
+    p = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    p.add_argument("--context-kb", type=int, default=300, help="Size of the shared team context")
+    p.add_argument("--answer-kb", type=int, default=8, help="Size of the answer under review")
+    p.add_argument("--calls", type=int, default=8, help="Critic/review calls per query")
+    p.add_argument("--rounds", type=int, default=20, help="Queries to time")
+    args = p.parse_args(argv)
+
+    context_text = _text(args.context_kb, "context")
+    answer = _text(args.answer_kb, "answer")
+    sections = [answer[i : i + 2048] for i in range(0, len(answer), 2048)][:4]
+    bench_args = (context_text, answer, sections, args.calls)
+
+    print(f"context={args.context_kb}KB answer={args.answer_kb}KB calls/query={args.calls} rounds={args.rounds}")
+    print(f"{'variant':<8} {'ms/call':>10} {'alloc KB/call':>14} {'body KB':>10}")
+    for name, fn in (("inline", inline_bodies), ("shared", shared_bodies)):
+        r = measure(fn, bench_args, args.rounds)
+        print(f"{name:<8} {r['ms_per_call']:>10.3f} {r['alloc_kb_per_call']:>14.1f} {r['body_kb']:>10.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
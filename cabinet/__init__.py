@@ -4,6 +4,31 @@ Expose the main `Cabinet` orchestrator for easy importing.
 """
 
 from .orchestrator import Cabinet, CabinetResult
+from .session import CabinetSession
+from .cancellation import CancellationToken, QueryCancelled
+from .events import (
+    CabinetEvent,
+    RoutingDecided,
+    PlanReady,
+    StepStarted,
+    StepFinished,
+    DraftReady,
+    CritiqueReady,
+    FinalAnswer,
+)
 
-__all__ = ["Cabinet", "CabinetResult"]
-
+__all__ = [
+    "Cabinet",
+    "CabinetResult",
+    "CabinetSession",
+    "CancellationToken",
+    "QueryCancelled",
+    "CabinetEvent",
+    "RoutingDecided",
+    "PlanReady",
+    "StepStarted",
+    "StepFinished",
+    "DraftReady",
+    "CritiqueReady",
+    "FinalAnswer",
+]
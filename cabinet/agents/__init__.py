@@ -5,6 +5,7 @@ from .specialists import (
     EngineerAgent,
     AnalystAgent,
     SynthesizerAgent,
+    CondenserAgent,
     CriticAgent,
 )
 from .decider import ModelDeciderAgent
@@ -19,5 +20,6 @@ __all__ = [
     "EngineerAgent",
     "AnalystAgent",
     "SynthesizerAgent",
+    "CondenserAgent",
     "CriticAgent",
 ]
@@ -1,18 +1,23 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import List, Dict, Optional
 
 from ..api_client import call_llm_api
+from ..cancellation import CancellationToken
+from ..models import GenerationConfig
+
+
+@lru_cache(maxsize=32)
+def _system_message(system_prompt: str) -> Dict[str, str]:
+    # One shared dict per system prompt (never mutated) instead of a new one per call.
+    return {"role": "system", "content": system_prompt}
 
 
 def _normalize_history(system_prompt: Optional[str], history: List[Dict[str, str]], user_content: str) -> List[Dict[str, str]]:
-    msgs: List[Dict[str, str]] = []
-    if system_prompt:
-        msgs.append({"role": "system", "content": system_prompt})
-    msgs.extend(history)
-    msgs.append({"role": "user", "content": user_content})
-    return msgs
+    head = [_system_message(system_prompt)] if system_prompt else []
+    return [*head, *history, {"role": "user", "content": user_content}]
 
 
 @dataclass
@@ -20,14 +25,26 @@ class LlmAgent:
     name: str
     system_prompt: str
     model: str = "gpt-4o-mini"
+    generation: Optional[GenerationConfig] = None
 
     def run(
         self,
         prompt: str,
         history: Optional[List[Dict[str, str]]] = None,
         model_override: Optional[str] = None,
+        generation: Optional[GenerationConfig] = None,
+        project: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> str:
         history = history or []
         messages = _normalize_history(self.system_prompt, history, prompt)
         selected = model_override or self.model
-        return call_llm_api(selected, messages)
+        config = (self.generation or GenerationConfig()).merged(generation)
+        return call_llm_api(
+            selected,
+            messages,
+            project=project,
+            cancel_token=cancel_token,
+            role=self.name,
+            **config.api_options(selected),
+        )
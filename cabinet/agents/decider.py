@@ -5,6 +5,8 @@ from dataclasses import dataclass
 from typing import Dict, Any, List
 
 from .base import LlmAgent
+from ..cancellation import CancellationToken
+from ..models import GenerationConfig
 
 
 DECIDER_SYSTEM = (
@@ -23,7 +25,16 @@ class ModelDeciderAgent(LlmAgent):
     def __init__(self, model: str = "gpt-4o-mini") -> None:
         super().__init__(name="decider", system_prompt=DECIDER_SYSTEM, model=model)
 
-    def decide(self, user_request: str, allowed_models: List[str], routing_goal: str = "balanced", model_override: str | None = None) -> Dict[str, Any]:
+    def decide(
+        self,
+        user_request: str,
+        allowed_models: List[str],
+        routing_goal: str = "balanced",
+        model_override: str | None = None,
+        generation: GenerationConfig | None = None,
+        project: str | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> Dict[str, Any]:
         prompt = (
             "Routing goal: "
             + routing_goal
@@ -32,7 +43,13 @@ class ModelDeciderAgent(LlmAgent):
             + "\nUser request:\n"
             + user_request
         )
-        raw = self.run(prompt, model_override=model_override)
+        raw = self.run(
+            prompt,
+            model_override=model_override,
+            generation=generation,
+            project=project,
+            cancel_token=cancel_token,
+        )
         return self._parse_json(raw)
 
     @staticmethod
@@ -5,6 +5,8 @@ from typing import List, Dict, Any
 import json
 
 from .base import LlmAgent
+from ..cancellation import CancellationToken
+from ..models import GenerationConfig
 
 
 PLANNER_SYSTEM_PROMPT = (
@@ -34,8 +36,34 @@ class PlannerAgent(LlmAgent):
     def __init__(self, model: str = "gpt-4o-mini") -> None:
         super().__init__(name="planner", system_prompt=PLANNER_SYSTEM_PROMPT, model=model)
 
-    def plan(self, user_request: str, model_override: str | None = None) -> Plan:
-        raw = self.run(user_request, model_override=model_override)
+    def plan(
+        self,
+        user_request: str,
+        model_override: str | None = None,
+        generation: GenerationConfig | None = None,
+        project: str | None = None,
+        prior_steps: List[Any] | None = None,
+        history: List[Dict[str, str]] | None = None,
+        cancel_token: CancellationToken | None = None,
+    ) -> Plan:
+        prompt = user_request
+        if prior_steps:
+            done = "\n".join(f"- {s.step_id} [{s.agent}] {s.objective}" for s in prior_steps)
+            prompt = (
+                "Follow-up request in an ongoing conversation.\n"
+                f"Steps already completed (their outputs will be reused):\n{done}\n\n"
+                "Plan ONLY the additional steps the new request needs. "
+                "Return {\"steps\": []} if the completed steps already cover it.\n\n"
+                f"New request: {user_request}"
+            )
+        raw = self.run(
+            prompt,
+            history=history,
+            model_override=model_override,
+            generation=generation,
+            project=project,
+            cancel_token=cancel_token,
+        )
         data = self._parse_json(raw)
         steps = [
             PlanStep(
@@ -46,7 +74,7 @@ class PlannerAgent(LlmAgent):
             )
             for i, s in enumerate(data.get("steps", []))
         ]
-        if not steps:
+        if not steps and not prior_steps:
             # Fallback minimal plan
             steps = [
                 PlanStep(id="s1", agent="researcher", objective="gather facts and definitions", guidance=""),
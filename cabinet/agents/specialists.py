@@ -34,6 +34,14 @@ SYNTHESIZER_SYSTEM = (
 )
 
 
+CONDENSER_SYSTEM = (
+    "You are Condenser.\n"
+    "Maintain compact running notes that fold team step outputs into a partial\n"
+    "synthesis. Keep every key fact, decision, number, and caveat; drop repetition\n"
+    "and filler. Respond with the updated notes only.\n"
+)
+
+
 CRITIC_SYSTEM = (
     "You are Critic.\n"
     "Review the proposed final answer for correctness, clarity, completeness,\n"
@@ -66,6 +74,12 @@ class SynthesizerAgent(LlmAgent):
         super().__init__(name="synthesizer", system_prompt=SYNTHESIZER_SYSTEM, model=model)
 
 
+@dataclass
+class CondenserAgent(LlmAgent):
+    def __init__(self, model: str = "gpt-4o-mini") -> None:
+        super().__init__(name="condenser", system_prompt=CONDENSER_SYSTEM, model=model)
+
+
 @dataclass
 class CriticAgent(LlmAgent):
     def __init__(self, model: str = "gpt-4o-mini") -> None:
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import queue
+import random
+import re
+import sqlite3
+import struct
+import threading
+import time
+import unicodedata
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+
+_MERSENNE = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_FILLER = {
+    "a", "an", "the", "please", "can", "could", "would", "you", "me", "i", "tell", "explain",
+    "kindly", "hey", "hi", "just", "some", "do", "does", "is", "are", "to", "of",
+}
+
+
+def normalize_query(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text).lower().replace("\u2019", "'")
+    text = re.sub(r"'s\b", " is", text)
+    text = re.sub(r"[^\w\s]", " ", text)
+    words = [w for w in text.split() if w not in _FILLER]
+    return " ".join(words)
+
+
+def _shingles(text: str, k: int = 4) -> Set[int]:
+    # Character k-grams over the normalized text work for short questions too.
+    text = text or " "
+    grams = {text[i : i + k] for i in range(max(1, len(text) - k + 1))}
+    return {struct.unpack("<Q", hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest())[0] for g in grams}
+
+
+class MinHasher:
+    def __init__(self, num_perm: int = 64, seed: int = 1) -> None:
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._perms = [(rng.randrange(1, _MERSENNE), rng.randrange(0, _MERSENNE)) for _ in range(num_perm)]
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        hashes = _shingles(normalize_query(text))
+        return tuple(min(((a * h + b) % _MERSENNE) & _MAX_HASH for h in hashes) for a, b in self._perms)
+
+    @staticmethod
+    def similarity(a: Tuple[int, ...], b: Tuple[int, ...]) -> float:
+        return sum(1 for x, y in zip(a, b) if x == y) / float(len(a) or 1)
+
+
+def _pack(sig: Tuple[int, ...]) -> bytes:
+    return struct.pack(f"<{len(sig)}I", *sig)
+
+
+def _unpack(blob: bytes) -> Tuple[int, ...]:
+    return struct.unpack(f"<{len(blob) // 4}I", blob)
+
+
+def _default_path() -> str:
+    env = os.environ.get("CABINET_ANSWER_CACHE")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cabinet", "answers.sqlite3")
+
+
+class AnswerCache:
+    """Near-duplicate cache of final results keyed by MinHash/LSH of the query.
+
+    Lookups only touch the in-memory LSH index and, on a hit, read one row by
+    primary key. Inserts, TTL expiry and size-based eviction happen on a
+    background writer thread, so the answer path never waits on index upkeep.
+    Call close() (or flush()) before exiting so queued inserts are written.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        threshold: float = 0.8,
+        ttl: float = 86400.0,
+        max_entries: int = 10000,
+        max_bytes: int = 256 * 1024 * 1024,
+        num_perm: int = 64,
+        bands: int = 16,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.path = path or _default_path()
+        self.threshold = float(threshold)
+        self.ttl = float(ttl)
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm=num_perm)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._lock = threading.Lock()
+        # id -> (ns, sig, created, size), oldest first: a re-insert moves an entry to the end.
+        self._entries: Dict[str, Tuple[str, Tuple[int, ...], float, int]] = {}
+        self._bytes = 0
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = {}
+        self._reader = sqlite3.connect(self.path, check_same_thread=False)
+        self._reader.execute("PRAGMA journal_mode=WAL")
+        self._reader.execute(
+            "CREATE TABLE IF NOT EXISTS answers ("
+            " id TEXT PRIMARY KEY, ns TEXT NOT NULL, created REAL NOT NULL,"
+            " sig BLOB NOT NULL, size INTEGER NOT NULL, result TEXT NOT NULL)"
+        )
+        self._reader.commit()
+        now = time.time()
+        rows = self._reader.execute("SELECT id, ns, created, sig, size FROM answers ORDER BY created")
+        for entry_id, ns, created, sig, size in rows:
+            if now - created < self.ttl:
+                self._index(entry_id, ns, _unpack(sig), created, size)
+
+        self._inbox: "queue.Queue[Optional[Tuple[str, Any]]]" = queue.Queue()
+        self._writer = threading.Thread(target=self._write_loop, name="cabinet-answer-cache", daemon=True)
+        self._writer.start()
+
+    @staticmethod
+    def namespace(**parts: Any) -> str:
+        return hashlib.sha1(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+    def _band_keys(self, ns: str, sig: Tuple[int, ...]) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        return [(ns, b, sig[b * self.rows : (b + 1) * self.rows]) for b in range(self.bands)]
+
+    def _index(self, entry_id: str, ns: str, sig: Tuple[int, ...], created: float, size: int) -> None:
+        self._entries[entry_id] = (ns, sig, created, size)
+        self._bytes += size
+        for key in self._band_keys(ns, sig):
+            self._buckets.setdefault(key, set()).add(entry_id)
+
+    def _unindex(self, entry_id: str) -> None:
+        entry = self._entries.pop(entry_id, None)
+        if entry is None:
+            return
+        ns, sig, _, size = entry
+        self._bytes -= size
+        for key in self._band_keys(ns, sig):
+            ids = self._buckets.get(key)
+            if ids is not None:
+                ids.discard(entry_id)
+                if not ids:
+                    del self._buckets[key]
+
+    def get(self, query: str, ns: str) -> Optional[Tuple[Dict[str, Any], float]]:
+        sig = self.hasher.signature(query)
+        now = time.time()
+        best: Optional[str] = None
+        best_sim = 0.0
+        with self._lock:
+            candidates: Set[str] = set()
+            for key in self._band_keys(ns, sig):
+                candidates |= self._buckets.get(key, set())
+            for entry_id in candidates:
+                _, other, created, _ = self._entries[entry_id]
+                if now - created >= self.ttl:
+                    continue
+                sim = MinHasher.similarity(sig, other)
+                if sim >= self.threshold and sim > best_sim:
+                    best, best_sim = entry_id, sim
+            if best is not None:
+                row = self._reader.execute("SELECT result FROM answers WHERE id = ?", (best,)).fetchone()
+            else:
+                row = None
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0]), best_sim
+
+    def put(self, query: str, ns: str, result: Dict[str, Any]) -> None:
+        self._inbox.put(("put", (query, ns, result)))
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        done = threading.Event()
+        self._inbox.put(("flush", done))
+        done.wait(timeout)
+
+    def close(self) -> None:
+        self._inbox.put(None)
+        self._writer.join()
+        self._reader.close()
+
+    def _write_loop(self) -> None:
+        conn = sqlite3.connect(self.path)
+        while True:
+            item = self._inbox.get()
+            if item is None:
+                conn.close()
+                return
+            op, payload = item
+            if op == "flush":
+                payload.set()
+                continue
+            try:
+                query, ns, result = payload
+                self._store(conn, query, ns, result)
+            except Exception:
+                continue
+
+    def _store(self, conn: sqlite3.Connection, query: str, ns: str, result: Dict[str, Any]) -> None:
+        sig = self.hasher.signature(query)
+        body = json.dumps(result)
+        entry_id = hashlib.sha1((ns + "\0" + normalize_query(query)).encode("utf-8")).hexdigest()
+        now = time.time()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO answers (id, ns, created, sig, size, result) VALUES (?, ?, ?, ?, ?, ?)",
+                (entry_id, ns, now, _pack(sig), len(body), body),
+            )
+        with self._lock:
+            self._unindex(entry_id)
+            self._index(entry_id, ns, sig, now, len(body))
+        # Entries are oldest first, so expired and evictable ones form a prefix. Only this
+        # thread changes the index, so it is scanned without the lock that get() needs.
+        count, total = len(self._entries), self._bytes
+        doomed: List[str] = []
+        for eid, (_, _, created, size) in self._entries.items():
+            if now - created < self.ttl and count <= self.max_entries and total <= self.max_bytes:
+                break
+            doomed.append(eid)
+            count -= 1
+            total -= size
+        if doomed:
+            with self._lock:
+                for eid in doomed:
+                    self._unindex(eid)
+            with conn:
+                conn.executemany("DELETE FROM answers WHERE id = ?", [(eid,) for eid in doomed])
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
@@ -1,8 +1,13 @@
 import os
+import threading
 import time
 import random
 import requests
 import json
+from functools import lru_cache
+
+from .cancellation import QueryCancelled
+from .concurrency import get_limiter
 
 
 class LLMAPIError(Exception):
@@ -15,27 +20,186 @@ class ModelNotFoundError(LLMAPIError):
         self.model = model
 
 
-# Ensure LLMFOUNDRY_TOKEN is in os.environ
-def call_llm_api(model_name, messages):
-    base = os.environ.get("LLMFOUNDRY_BASE_URL", "https://llmfoundry.straive.com/openai/v1")
-    url = base.rstrip("/") + "/chat/completions"
-    headers = {
-        "Authorization": f"Bearer {os.environ.get('LLMFOUNDRY_TOKEN')}:my-test-project",
+_local = threading.local()
+
+
+def last_call_attempts():
+    # HTTP attempts (1 + retries) made by the most recent call_llm_api in this thread.
+    return getattr(_local, "attempts", 0)
+
+
+def api_base_url():
+    return os.environ.get("LLMFOUNDRY_BASE_URL", "https://llmfoundry.straive.com/openai/v1").rstrip("/")
+
+
+def _headers(project=None):
+    # The token suffix names the project (tenant) the call is billed and rate-limited under.
+    project = project or os.environ.get("CABINET_PROJECT", "my-test-project")
+    return {
+        "Authorization": f"Bearer {os.environ.get('LLMFOUNDRY_TOKEN')}:{project}",
         "Content-Type": "application/json"
     }
+
+
+@lru_cache(maxsize=4)
+def _parse_model_timeouts(raw):
+    try:
+        data = json.loads(raw)
+        return {str(k): v for k, v in data.items() if isinstance(v, dict)}
+    except Exception:
+        return {}
+
+
+def request_timeouts(model_name, connect_timeout=None, read_timeout=None):
+    # (connect, read) for one attempt: explicit (per-role) values, then the model's
+    # entry in CABINET_MODEL_TIMEOUTS, then CABINET_API_CONNECT_TIMEOUT / CABINET_API_READ_TIMEOUT.
+    per_model = _parse_model_timeouts(os.environ.get("CABINET_MODEL_TIMEOUTS") or "{}").get(model_name, {})
+    if connect_timeout is None:
+        connect_timeout = per_model.get("connect", os.environ.get("CABINET_API_CONNECT_TIMEOUT", "10"))
+    if read_timeout is None:
+        read_timeout = per_model.get("read", os.environ.get("CABINET_API_READ_TIMEOUT", "60"))
+    return float(connect_timeout), float(read_timeout)
+
+
+def _wait(delay, cancel_token=None):
+    if cancel_token is None:
+        time.sleep(delay)
+    elif cancel_token.wait(delay):
+        raise QueryCancelled(cancel_token.reason or "cancelled")
+
+
+def list_models(timeout=15):
+    # One GET against the OpenAI-compatible model listing; no retries.
+    try:
+        response = requests.get(api_base_url() + "/models", headers=_headers(), timeout=timeout)
+        response.raise_for_status()
+        data = response.json()
+    except requests.RequestException as e:
+        raise LLMAPIError(str(e))
+    except ValueError as e:
+        raise LLMAPIError(f"Invalid model listing: {e}")
+    items = data.get("data") if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        raise LLMAPIError("Invalid model listing: no data array")
+    return [str(x.get("id")) if isinstance(x, dict) else str(x) for x in items if x]
+
+
+def probe_model(model_name, timeout=15):
+    # Single 1-token completion. Only a 404 proves the model is missing;
+    # anything else (429, 5xx, network) is inconclusive and reported as None.
     payload = {
         "model": model_name,
-        "messages": messages,
-        "temperature": 0.7
+        "messages": [{"role": "user", "content": "ping"}],
+        "max_tokens": 1,
+        "temperature": 0,
     }
+    try:
+        response = requests.post(api_base_url() + "/chat/completions", headers=_headers(), json=payload, timeout=timeout)
+    except requests.RequestException:
+        return None
+    if response.status_code == 404:
+        return False
+    if response.ok:
+        return True
+    return None
+
+
+def _dumps(obj):
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), allow_nan=False).encode("utf-8")
+
+
+class EncodedMessage(dict):
+    # Chat message that keeps its JSON encoding, for content that several calls of
+    # one query send (the team context). The bytes live and die with the message.
+    _encoded = None
+
+    def encoded(self):
+        if self._encoded is None:
+            self._encoded = _dumps(self)
+        return self._encoded
+
+
+def encode_message(message):
+    if isinstance(message, EncodedMessage):
+        return message.encoded()
+    return _dumps(message)
+
+
+def encode_payload(model_name, messages, **options):
+    # Equivalent to requests' json=payload, but assembled from per-message pieces.
+    # One join over all pieces, so the body is copied once whatever its size.
+    head = _dumps({"model": model_name, **{k: v for k, v in options.items() if v is not None}})
+    parts = [head[:-1], b',"messages":[']
+    for i, m in enumerate(messages):
+        if i:
+            parts.append(b",")
+        parts.append(encode_message(m))
+    parts.append(b"]}")
+    return b"".join(parts)
+
+
+def _post(url, headers, body, timeout, cancel_token=None, kind=None):
+    # When adaptive concurrency is on, every HTTP attempt holds a limiter slot and
+    # reports 429/5xx, timeouts and connection failures as overload so the shared
+    # limit backs off. `kind` keys the latency baseline the limiter uses for spikes.
+    limiter = get_limiter()
+    if limiter is None:
+        return requests.post(url, headers=headers, data=body, timeout=timeout)
+    limiter.acquire(cancel_token)
+    started = time.monotonic()
+    overloaded = False
+    ok = False
+    try:
+        response = requests.post(url, headers=headers, data=body, timeout=timeout)
+        overloaded = response.status_code == 429 or response.status_code >= 500
+        ok = response.ok
+        return response
+    except (requests.Timeout, requests.ConnectionError):
+        overloaded = True
+        raise
+    finally:
+        limiter.release(time.monotonic() - started, overloaded=overloaded, key=kind, ok=ok)
+
+
+# Ensure LLMFOUNDRY_TOKEN is in os.environ
+def call_llm_api(
+    model_name,
+    messages,
+    temperature=0.7,
+    max_tokens=None,
+    stop=None,
+    response_format=None,
+    project=None,
+    connect_timeout=None,
+    read_timeout=None,
+    cancel_token=None,
+    role=None,
+):
+    url = api_base_url() + "/chat/completions"
+    headers = _headers(project)
+    # Encoded once up front; retries resend the same bytes.
+    body = encode_payload(
+        model_name,
+        messages,
+        temperature=temperature,
+        max_tokens=int(max_tokens) if max_tokens is not None else None,
+        stop=stop or None,
+        response_format=response_format or None,
+    )
+    timeout = request_timeouts(model_name, connect_timeout, read_timeout)
     max_retries = int(os.environ.get("CABINET_API_MAX_RETRIES", "5"))
     base_backoff = float(os.environ.get("CABINET_API_BACKOFF", "1.0"))
 
     attempt = 0
     while True:
         response = None
+        _local.attempts = attempt + 1
+        if cancel_token is not None:
+            cancel_token.raise_if_cancelled()
         try:
-            response = requests.post(url, headers=headers, json=payload, timeout=60)
+            response = _post(url, headers, body, timeout=timeout, cancel_token=cancel_token, kind=(role, model_name))
+            if cancel_token is not None:
+                cancel_token.raise_if_cancelled()
             response.raise_for_status()
             data = response.json()
             return data['choices'][0]['message']['content']
@@ -64,7 +228,7 @@ def call_llm_api(model_name, messages):
                             retry_after = 0.0
                 delay = max(retry_after, base_backoff * (2 ** (attempt - 1)))
                 delay = delay + random.uniform(0, 0.5)
-                time.sleep(delay)
+                _wait(delay, cancel_token)
                 continue
 
             # otherwise, raise a general error
@@ -78,6 +242,6 @@ def call_llm_api(model_name, messages):
             if attempt < max_retries:
                 attempt += 1
                 delay = base_backoff * (2 ** (attempt - 1)) + random.uniform(0, 0.5)
-                time.sleep(delay)
+                _wait(delay, cancel_token)
                 continue
             raise LLMAPIError(str(e))
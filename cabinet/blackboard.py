@@ -12,6 +12,18 @@ class StepResult:
     output: str
 
 
+@dataclass
+class CallRecord:
+    stage: str
+    role: str
+    model: str
+    started: float
+    latency: float
+    ok: bool
+    fallback: int = 0
+    attempts: int = 1
+
+
 @dataclass
 class Blackboard:
     notes: List[str] = field(default_factory=list)
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import threading
+from typing import Callable, List, Optional
+
+
+class QueryCancelled(Exception):
+    """Raised inside a query's calls once its CancellationToken has been cancelled."""
+
+
+class CancellationToken:
+    """Shared flag that stops one query's work.
+
+    Retry waits, queued scheduler calls, limiter waits and pending steps all
+    watch the token. Cancelling it makes them raise QueryCancelled, which frees
+    their slots instead of sleeping or waiting until they time out. A request
+    already on the wire finishes or hits its read timeout, and its result is
+    then discarded.
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled") -> None:
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for fn in callbacks:
+            try:
+                fn()
+            except Exception:
+                pass
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep up to `timeout` seconds; True as soon as the token is cancelled."""
+        return self._event.wait(timeout)
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise QueryCancelled(self.reason or "cancelled")
+
+    def add_callback(self, fn: Callable[[], None]) -> None:
+        # Runs once on cancel (immediately if already cancelled).
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(fn)
+                return
+        fn()
+
+    def remove_callback(self, fn: Callable[[], None]) -> None:
+        with self._lock:
+            try:
+                self._callbacks.remove(fn)
+            except ValueError:
+                pass
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Set
+
+from .api_client import LLMAPIError, api_base_url, list_models, probe_model
+
+
+def _default_cache_path() -> str:
+    env = os.environ.get("CABINET_CATALOG_CACHE")
+    if env:
+        return env
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "cabinet", "models.json")
+
+
+def _default_ttl() -> float:
+    try:
+        return float(os.environ.get("CABINET_CATALOG_TTL", "21600"))
+    except ValueError:
+        return 21600.0
+
+
+@dataclass
+class ModelCatalog:
+    """Which models the endpoint actually serves, cached on disk with a TTL.
+
+    The endpoint's model listing is tried first. If it is unavailable, each
+    candidate gets a 1-token probe; only a 404 marks a model dead, so
+    inconclusive probes never hide a model.
+    """
+
+    cache_path: str = field(default_factory=_default_cache_path)
+    ttl: float = field(default_factory=_default_ttl)
+    probe_workers: int = 8
+    # complete=True: `alive` is the full served list. Otherwise only `dead` is authoritative.
+    alive: Set[str] = field(default_factory=set)
+    dead: Set[str] = field(default_factory=set)
+    complete: bool = False
+    fetched_at: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def _fresh(self) -> bool:
+        return self.fetched_at > 0 and (time.time() - self.fetched_at) < self.ttl
+
+    @property
+    def fresh(self) -> bool:
+        return self._fresh()
+
+    def _load(self) -> bool:
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return False
+        if not isinstance(data, dict) or data.get("base_url") != api_base_url():
+            return False
+        self.alive = set(data.get("alive") or [])
+        self.dead = set(data.get("dead") or [])
+        self.complete = bool(data.get("complete"))
+        self.fetched_at = float(data.get("fetched_at") or 0.0)
+        return self._fresh()
+
+    def _save(self) -> None:
+        data = {
+            "base_url": api_base_url(),
+            "fetched_at": self.fetched_at,
+            "complete": self.complete,
+            "alive": sorted(self.alive),
+            "dead": sorted(self.dead),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.cache_path) or ".", exist_ok=True)
+            tmp = self.cache_path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, self.cache_path)
+        except OSError:
+            pass
+
+    def _unknown(self, models: Iterable[str]) -> List[str]:
+        if self.complete:
+            return []
+        return [m for m in dict.fromkeys(models) if m and m not in self.alive and m not in self.dead]
+
+    def refresh(self, candidates: Iterable[str] = (), force: bool = False) -> None:
+        candidates = [m for m in candidates if m]
+        with self._lock:
+            if not force and (self._fresh() or self._load()) and not self._unknown(candidates):
+                return
+            try:
+                served = list_models()
+            except LLMAPIError:
+                served = []
+            if served:
+                self.alive, self.dead, self.complete = set(served), set(), True
+            else:
+                if force or not self._fresh():
+                    self.alive, self.dead, self.complete = set(), set(), False
+                pending = self._unknown(candidates)
+                if pending:
+                    with ThreadPoolExecutor(max_workers=max(1, min(self.probe_workers, len(pending)))) as ex:
+                        for model, ok in zip(pending, ex.map(probe_model, pending)):
+                            if ok is True:
+                                self.alive.add(model)
+                            elif ok is False:
+                                self.dead.add(model)
+            self.fetched_at = time.time()
+            self._save()
+
+    def is_available(self, model: str) -> bool:
+        if self.complete:
+            return model in self.alive
+        return model not in self.dead
+
+    def filter(self, models: Iterable[str]) -> List[str]:
+        return [m for m in models if m and self.is_available(m)]
+
+    def snapshot(self) -> Dict[str, object]:
+        return {
+            "complete": self.complete,
+            "alive": sorted(self.alive),
+            "dead": sorted(self.dead),
+            "fetched_at": self.fetched_at,
+        }
@@ -1,12 +1,233 @@
 import argparse
+import json
 import os
 import sys
+import time
 
 from .orchestrator import Cabinet
+from .catalog import ModelCatalog
+from .scheduler import get_scheduler
+from .history import RunHistory, format_stats, parse_window
+from .jobqueue import SQLiteJobQueue
+from .answer_cache import AnswerCache
+from .worker import run_worker, run_worker_processes
+from .events import (
+    CritiqueReady,
+    DraftReady,
+    FinalAnswer,
+    PlanReady,
+    RoutingDecided,
+    StepFinished,
+    StepStarted,
+)
+
+
+def _describe_event(event) -> str:
+    if isinstance(event, RoutingDecided):
+        return f"routing: {event.role_models}"
+    if isinstance(event, PlanReady):
+        return f"plan: {len(event.plan.steps)} steps"
+    if isinstance(event, StepStarted):
+        return f"step {event.step_id} started [{event.agent}] {event.objective}"
+    if isinstance(event, StepFinished):
+        return f"step {event.result.step_id} finished in {event.duration:.2f}s"
+    if isinstance(event, DraftReady):
+        return f"draft ready ({len(event.draft)} chars)"
+    if isinstance(event, CritiqueReady):
+        return f"critique {event.iteration}: quality={event.critique.get('quality')} -> {event.decision}"
+    return event.kind
+
+
+def stats_main(argv):
+    p = argparse.ArgumentParser(prog="cabinet stats", description="Latency, fallback and retry report from run history")
+    p.add_argument("--db", default=None, help="History database (default: env CABINET_HISTORY_DB or ~/.local/share/cabinet/history.sqlite3)")
+    p.add_argument("--since", default="24h", help="Time window, e.g. 90m, 24h, 7d (default 24h)")
+    p.add_argument("--slowest", type=int, default=10, help="Number of slowest queries to list")
+    p.add_argument("--json", action="store_true", help="Print raw JSON")
+    args = p.parse_args(argv)
+
+    history = RunHistory(args.db)
+    stats = history.stats(since=time.time() - parse_window(args.since), slowest=args.slowest)
+    history.close()
+    if args.json:
+        print(json.dumps(stats, indent=2))
+    else:
+        print(format_stats(stats))
+    return 0
+
+
+def _default_queue_path():
+    return os.environ.get("CABINET_QUEUE_DB", "cabinet-jobs.sqlite3")
+
+
+def enqueue_main(argv):
+    p = argparse.ArgumentParser(prog="cabinet enqueue", description="Add questions to the durable job queue")
+    p.add_argument("questions", nargs="*", help="Questions to enqueue")
+    p.add_argument("--queue", default=_default_queue_path(), help="Queue database (default: env CABINET_QUEUE_DB or ./cabinet-jobs.sqlite3)")
+    p.add_argument("--file", default=None, help="Read one question per line from this file ('-' for stdin)")
+    p.add_argument("--iterations", type=int, default=2, help="Max critique iterations (>=1)")
+    p.add_argument("--no-parallel", action="store_true", help="Disable parallel step execution")
+    p.add_argument("--max-attempts", type=int, default=3, help="Attempts before a job is marked failed")
+    args = p.parse_args(argv)
+
+    questions = list(args.questions)
+    if args.file:
+        f = sys.stdin if args.file == "-" else open(args.file, "r", encoding="utf-8")
+        with f:
+            questions.extend(line.strip() for line in f if line.strip())
+    queue = SQLiteJobQueue(args.queue, max_attempts=args.max_attempts)
+    params = {"max_iterations": max(1, args.iterations), "parallel": not args.no_parallel}
+    for q in questions:
+        print(queue.enqueue(q, params))
+    return 0
+
+
+def jobs_main(argv):
+    p = argparse.ArgumentParser(prog="cabinet jobs", description="Show job queue status or dump finished results")
+    p.add_argument("--queue", default=_default_queue_path(), help="Queue database")
+    p.add_argument("--results", action="store_true", help="Print finished jobs as JSON lines")
+    args = p.parse_args(argv)
+
+    queue = SQLiteJobQueue(args.queue)
+    if args.results:
+        for row in queue.iter_results():
+            print(json.dumps(row))
+    else:
+        print(json.dumps(queue.counts()))
+    return 0
+
+
+def worker_main(argv):
+    p = argparse.ArgumentParser(prog="cabinet worker", description="Answer queued questions from the durable job queue")
+    p.add_argument("--queue", default=_default_queue_path(), help="Queue database")
+    p.add_argument("--processes", type=int, default=1, help="Worker processes to run on this host")
+    p.add_argument("--visibility-timeout", type=float, default=300.0, help="Lease length in seconds (renewed while a job runs)")
+    p.add_argument("--poll", type=float, default=1.0, help="Seconds between polls when the queue is empty")
+    p.add_argument("--max-jobs", type=int, default=None, help="Exit after this many jobs (per process)")
+    p.add_argument("--idle-exit", type=float, default=None, help="Exit after this many idle seconds")
+    p.add_argument("--model", default="gpt-4o-mini", help="Default model name")
+    p.add_argument("--available-models", default=None, help="Comma-separated list or JSON array of allowed models")
+    p.add_argument("--decider-model", default=None, help="Model used to make the routing decision")
+    p.add_argument("--routing-goal", default="balanced", choices=["balanced", "quality", "speed"], help="Routing preference")
+    p.add_argument("--max-workers", type=int, default=4, help="Parallel steps per job")
+    args = p.parse_args(argv)
+
+    if not os.environ.get("LLMFOUNDRY_TOKEN"):
+        print("ERROR: LLMFOUNDRY_TOKEN is not set in environment.", file=sys.stderr)
+        return 2
+
+    from .models import load_available_models
+
+    cabinet_kwargs = {
+        "default_model": args.model,
+        "available_models": load_available_models(args.available_models),
+        "decider_model": args.decider_model,
+        "routing_goal": args.routing_goal,
+        "max_workers": args.max_workers,
+    }
+    worker_kwargs = {
+        "visibility_timeout": args.visibility_timeout,
+        "poll_interval": args.poll,
+        "max_jobs": args.max_jobs,
+        "idle_exit": args.idle_exit,
+    }
+    SQLiteJobQueue(args.queue)  # create the schema once before workers race for it
+    if args.processes > 1:
+        run_worker_processes(args.queue, args.processes, cabinet_kwargs, **worker_kwargs)
+    else:
+        done = run_worker(SQLiteJobQueue(args.queue), lambda: Cabinet(**cabinet_kwargs), **worker_kwargs)
+        print(f"Worker finished {done} job(s)", file=sys.stderr)
+    return 0
+
+
+def loadtest_main(argv):
+    from .loadtest import StubServer, format_header, format_row, run_loadtest, write_report
+
+    p = argparse.ArgumentParser(prog="cabinet loadtest", description="Throughput and latency versus concurrency against a stub endpoint")
+    p.add_argument("--levels", default="1,2,4,8,16", help="Comma-separated concurrency levels (simultaneous answer() calls)")
+    p.add_argument("--requests", type=int, default=32, help="Queries per level (at least the level itself)")
+    p.add_argument("--endpoint", default=None, help="Base URL of an already running stub; default starts one in-process")
+    p.add_argument("--serve", type=int, default=None, metavar="PORT", help="Only run the stub server on PORT until interrupted")
+    p.add_argument("--stub-latency", type=float, default=0.2, help="Stub seconds per call")
+    p.add_argument("--stub-jitter", type=float, default=0.1, help="Extra uniform random stub seconds per call")
+    p.add_argument("--stub-steps", type=int, default=3, help="Steps in the stub planner's plan")
+    p.add_argument("--stub-words", type=int, default=200, help="Words in each stub text reply")
+    p.add_argument("--max-workers", type=int, default=4, help="Parallel steps per query (Cabinet max_workers)")
+    p.add_argument("--no-parallel", action="store_true", help="Run steps sequentially")
+    p.add_argument("--iterations", type=int, default=2, help="Max critique iterations (>=1)")
+    p.add_argument("--coalesce-steps", action="store_true", help="Merge steps for the same agent and model into one request")
+    p.add_argument("--scheduler", action="store_true", help="Queue LLM calls through the process-wide scheduler")
+    p.add_argument("--adaptive-concurrency", action="store_true", help="Adapt in-flight request limit (AIMD)")
+    p.add_argument("--output", default=None, help="Write results to this .json or .csv file")
+    args = p.parse_args(argv)
+
+    stub_options = {
+        "latency": args.stub_latency,
+        "jitter": args.stub_jitter,
+        "steps": args.stub_steps,
+        "reply_words": args.stub_words,
+    }
+    if args.serve is not None:
+        server = StubServer(port=args.serve, **stub_options)
+        print(f"Stub endpoint: {server.url}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+        return 0
+
+    server = None
+    if args.endpoint:
+        os.environ["LLMFOUNDRY_BASE_URL"] = args.endpoint
+    else:
+        # In-process stub: its threads and memory are included in the figures; use --serve/--endpoint to separate them.
+        server = StubServer(**stub_options).start()
+        os.environ["LLMFOUNDRY_BASE_URL"] = server.url
+    os.environ.setdefault("LLMFOUNDRY_TOKEN", "loadtest")
+
+    def make_cabinet():
+        return Cabinet(
+            max_workers=args.max_workers,
+            coalesce_steps=args.coalesce_steps,
+            scheduler=get_scheduler() if args.scheduler else None,
+            adaptive_concurrency=args.adaptive_concurrency,
+        )
+
+    levels = [int(x) for x in args.levels.split(",") if x.strip()]
+    print(format_header())
+    try:
+        rows = run_loadtest(
+            make_cabinet,
+            levels,
+            args.requests,
+            parallel=not args.no_parallel,
+            max_iterations=max(1, args.iterations),
+            on_level=lambda row: print(format_row(row), flush=True),
+        )
+    finally:
+        if server is not None:
+            server.stop()
+    for row in rows:
+        if row["first_error"]:
+            print(f"concurrency {row['concurrency']}: {row['errors']} error(s), first: {row['first_error']}", file=sys.stderr)
+    if args.output:
+        write_report(rows, args.output)
+    return 0
 
 
 def main(argv=None):
     argv = argv or sys.argv[1:]
+    if argv and argv[0] == "loadtest":
+        return loadtest_main(argv[1:])
+    if argv and argv[0] == "stats":
+        return stats_main(argv[1:])
+    if argv and argv[0] == "worker":
+        return worker_main(argv[1:])
+    if argv and argv[0] == "enqueue":
+        return enqueue_main(argv[1:])
+    if argv and argv[0] == "jobs":
+        return jobs_main(argv[1:])
     p = argparse.ArgumentParser(
         prog="cabinet",
         description="The Cabinet: multi-agent orchestration framework",
@@ -22,12 +243,30 @@ def main(argv=None):
     p.add_argument("--synthesizer-model", default=None)
     p.add_argument("--critic-model", default=None)
     p.add_argument("--no-parallel", action="store_true", help="Disable parallel step execution")
+    p.add_argument("--progressive", action="store_true", help="Fold step outputs into a running synthesis as they finish")
+    p.add_argument("--coalesce-steps", action="store_true", help="Merge steps for the same agent and model into one request")
+    p.add_argument("--speculative", type=float, default=None, metavar="FRACTION", help="Start the draft once this fraction of steps is done (e.g. 0.6)")
+    p.add_argument("--speculative-deadline", type=float, default=5.0, help="Seconds stragglers may take and still be absorbed without a revision call")
+    p.add_argument("--section-critique", action="store_true", help="Critique and repair answer sections in parallel")
+    p.add_argument("--adaptive-concurrency", action="store_true", help="Adapt in-flight request limit (AIMD) to 429s and latency")
+    p.add_argument("--scheduler", action="store_true", help="Queue LLM calls through the process-wide scheduler")
+    p.add_argument("--tenant", default=None, help="Tenant/project for fair queueing and the API auth header")
+    p.add_argument("--priority", default="interactive", choices=["interactive", "batch"], help="Scheduler priority class")
+    p.add_argument("--history", action="store_true", help="Append this run to the local history store (see `cabinet stats`)")
+    p.add_argument("--answer-cache", action="store_true", help="Reuse results of near-duplicate questions (MinHash cache)")
+    p.add_argument("--cache-threshold", type=float, default=0.8, help="Minimum estimated similarity for a cache hit")
     p.add_argument("--iterations", type=int, default=2, help="Max critique iterations (>=1)")
+    p.add_argument("--min-gain", type=float, default=0.5, help="Stop critiquing when a revision is expected to add fewer quality points")
+    p.add_argument("--seconds-per-point", type=float, default=None, help="Stop critiquing when a quality point would cost more seconds")
+    p.add_argument("--connect-timeout", type=float, default=None, help="Seconds to establish each API connection (default 10)")
+    p.add_argument("--read-timeout", type=float, default=None, help="Seconds to wait for each API response (default 60)")
     p.add_argument("--trace", action="store_true", help="Print plan and step outputs")
+    p.add_argument("--stream", action="store_true", help="Print progress events to stderr as they happen")
     # Dynamic routing inputs
     p.add_argument("--available-models", default=None, help="Comma-separated list or JSON array of allowed models")
     p.add_argument("--available-models-file", default=None, help="Path to JSON file (array or {models: [...]})")
     p.add_argument("--decider-model", default=None, help="Model used to make the routing decision")
+    p.add_argument("--check-models", action="store_true", help="Drop models the endpoint does not serve (cached model catalog)")
     p.add_argument("--routing-goal", default="balanced", choices=["balanced", "quality", "speed"], help="Routing preference")
     args = p.parse_args(argv)
 
@@ -35,6 +274,11 @@ def main(argv=None):
         print("ERROR: LLMFOUNDRY_TOKEN is not set in environment.", file=sys.stderr)
         return 2
 
+    if args.connect_timeout is not None:
+        os.environ["CABINET_API_CONNECT_TIMEOUT"] = str(args.connect_timeout)
+    if args.read_timeout is not None:
+        os.environ["CABINET_API_READ_TIMEOUT"] = str(args.read_timeout)
+
     overrides = {
         "planner": args.planner_model,
         "researcher": args.researcher_model,
@@ -55,6 +299,8 @@ def main(argv=None):
     )
 
     available_models = load_available_models(args.available_models, args.available_models_file)
+    catalog = ModelCatalog() if args.check_models else None
+    record_history = args.history or os.environ.get("CABINET_HISTORY", "0").lower() in ("1", "true", "yes", "on")
 
     cabinet = Cabinet(
         default_model=router.default_model,
@@ -62,12 +308,31 @@ def main(argv=None):
         available_models=available_models,
         decider_model=args.decider_model,
         routing_goal=args.routing_goal,
+        progressive_synthesis=args.progressive,
+        coalesce_steps=args.coalesce_steps,
+        section_critique=args.section_critique,
+        catalog=catalog,
+        adaptive_concurrency=args.adaptive_concurrency,
+        scheduler=get_scheduler() if args.scheduler else None,
+        tenant=args.tenant,
+        priority=args.priority,
+        history=RunHistory() if record_history else None,
+        answer_cache=AnswerCache(threshold=args.cache_threshold) if args.answer_cache else None,
+        critique_min_gain=args.min_gain,
+        critique_seconds_per_point=args.seconds_per_point,
+        speculative_fraction=args.speculative,
+        speculative_deadline=args.speculative_deadline,
     )
-    result = cabinet.answer(
+    result = None
+    for event in cabinet.answer_iter(
         args.question,
         parallel=not args.no_parallel,
         max_iterations=max(1, args.iterations),
-    )
+    ):
+        if isinstance(event, FinalAnswer):
+            result = event.result
+        elif args.stream:
+            print(f"[{event.elapsed:7.2f}s] {_describe_event(event)}", file=sys.stderr)
 
     if args.trace:
         print("\nPlan:")
@@ -80,9 +345,23 @@ def main(argv=None):
             print("Critique:")
             print(result.critique)
         print(f"Iterations: {result.iterations}")
+        for r in result.critique_rounds:
+            delta = f"{r.delta:+.1f}" if r.delta is not None else "n/a"
+            print(f"- round {r.iteration}: quality={r.quality} delta={delta} issues={r.issues} {r.seconds:.2f}s -> {r.decision}")
+        if result.stop_reason:
+            print(f"Critique stopped: {result.stop_reason}")
+        if result.speculation:
+            print(f"Speculative draft: {result.speculation}")
+        if result.cached:
+            print("Served from answer cache")
+        if cabinet.concurrency_limit is not None:
+            print(f"Concurrency limit: {cabinet.concurrency_limit}")
 
     print("\nFinal Answer:\n")
     print(result.final_answer)
+    if cabinet.answer_cache is not None:
+        # Inserts are written by a background thread; wait for them before exiting.
+        cabinet.answer_cache.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from typing import TYPE_CHECKING, Deque, Dict, Hashable, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .cancellation import CancellationToken
+
+
+class AdaptiveLimiter:
+    """AIMD limit on in-flight LLM requests, shared by every query in the process.
+
+    Each healthy response that returns while every slot was taken raises the
+    limit by `increase / limit` (about +increase per round-trip window); under
+    lighter load the limit stays where demand left it. A 429/5xx, a timeout or connection failure, or a
+    latency spike multiplies it by `decrease`, at most once per cooldown so one
+    burst is not punished twice. Spikes are judged against a latency average kept
+    per call kind (role and model), so a long synthesis never looks like a spike
+    next to short JSON calls. Other failures only free their slot.
+    """
+
+    def __init__(
+        self,
+        initial: float = 4,
+        min_limit: int = 1,
+        max_limit: int = 32,
+        increase: float = 1.0,
+        decrease: float = 0.5,
+        spike_factor: float = 3.0,
+        cooldown: float = 2.0,
+    ) -> None:
+        self.min_limit = max(1, int(min_limit))
+        self.max_limit = max(self.min_limit, int(max_limit))
+        self.increase = float(increase)
+        self.decrease = float(decrease)
+        self.spike_factor = float(spike_factor)
+        self.cooldown = float(cooldown)
+        self._limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self._in_flight = 0
+        self._ewma: Dict[Hashable, float] = {}
+        self._last_cut = 0.0
+        self._successes = 0
+        self._overloads = 0
+        self._history: Deque[Tuple[float, float]] = deque(maxlen=512)
+        self._history.append((time.time(), self._limit))
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, cancel_token: Optional["CancellationToken"] = None) -> None:
+        with self._cond:
+            while self._in_flight >= int(self._limit):
+                if cancel_token is not None:
+                    # Poll so a cancelled query stops queueing for a slot.
+                    cancel_token.raise_if_cancelled()
+                    self._cond.wait(0.2)
+                else:
+                    self._cond.wait()
+            self._in_flight += 1
+
+    def release(self, latency: float, overloaded: bool = False, key: Hashable = None, ok: bool = True) -> None:
+        with self._cond:
+            saturated = self._in_flight >= int(self._limit)
+            self._in_flight = max(0, self._in_flight - 1)
+            if not (ok or overloaded):
+                # Neither healthy nor a sign of overload (e.g. a 4xx): just free the slot.
+                self._cond.notify_all()
+                return
+            baseline = self._ewma.get(key)
+            spike = ok and baseline is not None and latency > baseline * self.spike_factor
+            if overloaded or spike:
+                self._overloads += 1
+                now = time.monotonic()
+                if now - self._last_cut >= self.cooldown:
+                    self._last_cut = now
+                    self._set_limit(self._limit * self.decrease)
+            else:
+                self._successes += 1
+                if saturated:
+                    # Only grow when demand actually hit the limit, so idle stretches do not
+                    # ratchet it up to max_limit ahead of the next burst.
+                    self._set_limit(self._limit + self.increase / max(self._limit, 1.0))
+            if not overloaded:
+                # Spikes still feed the average so a slower steady state becomes the new normal.
+                self._ewma[key] = latency if baseline is None else 0.8 * baseline + 0.2 * latency
+            self._cond.notify_all()
+
+    def _set_limit(self, value: float) -> None:
+        value = min(max(value, float(self.min_limit)), float(self.max_limit))
+        if int(value) != int(self._limit):
+            self._history.append((time.time(), value))
+        self._limit = value
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._cond:
+            return {
+                "limit": int(self._limit),
+                "in_flight": self._in_flight,
+                "ewma_latency": {str(k): v for k, v in self._ewma.items()},
+                "successes": self._successes,
+                "overloads": self._overloads,
+                "history": [(ts, int(v)) for ts, v in self._history],
+            }
+
+
+_limiter: Optional[AdaptiveLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, str(default)))
+    except ValueError:
+        return default
+
+
+def get_limiter() -> Optional[AdaptiveLimiter]:
+    if _limiter is None and os.environ.get("CABINET_ADAPTIVE_CONCURRENCY", "0").lower() in ("1", "true", "yes", "on"):
+        return enable_adaptive_concurrency()
+    return _limiter
+
+
+def enable_adaptive_concurrency(limiter: Optional[AdaptiveLimiter] = None) -> AdaptiveLimiter:
+    global _limiter
+    with _limiter_lock:
+        if limiter is not None:
+            _limiter = limiter
+        elif _limiter is None:
+            _limiter = AdaptiveLimiter(
+                initial=_env_int("CABINET_CONCURRENCY_INITIAL", 4),
+                min_limit=_env_int("CABINET_CONCURRENCY_MIN", 1),
+                max_limit=_env_int("CABINET_CONCURRENCY_MAX", 32),
+            )
+        return _limiter
+
+
+def disable_adaptive_concurrency() -> None:
+    global _limiter
+    with _limiter_lock:
+        _limiter = None
+
@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+# Why the critique loop stopped (or continued) after a round.
+REVISE = "revise"
+ACCEPTED = "accepted"
+PLATEAU = "plateau"
+REGRESSED = "regressed"
+LOW_GAIN = "low_gain"
+TOO_COSTLY = "too_costly"
+UNPARSEABLE = "unparseable"
+MAX_ITERATIONS = "max_iterations"
+
+
+def parse_critique(text: str) -> Optional[Dict[str, Any]]:
+    """Critic JSON as a dict, or None when the reply holds no usable JSON object."""
+    text = (text or "").strip()
+    candidates = [text]
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        candidates.append(text[start : end + 1])
+    for chunk in candidates:
+        try:
+            data = json.loads(chunk)
+        except Exception:
+            continue
+        if isinstance(data, dict):
+            return data
+    return None
+
+
+def critique_quality(critique: Dict[str, Any]) -> Optional[float]:
+    quality = critique.get("quality")
+    if isinstance(quality, bool):
+        return None
+    if isinstance(quality, (int, float)):
+        return float(quality)
+    try:
+        return float(str(quality).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass
+class CritiqueRound:
+    iteration: int
+    quality: Optional[float]
+    # Quality change since the previous scored round, i.e. what the revision in between bought.
+    delta: Optional[float]
+    issues: int
+    parsed: bool
+    decision: str
+    # Critic time for this round plus the revision it triggered, if any.
+    seconds: float = 0.0
+
+
+@dataclass
+class CritiqueController:
+    """Decide after each critic reply whether another revision is worth it.
+
+    Stops when the answer is accepted, when quality stopped improving since the
+    last revision, when the expected gain of one more revision falls below
+    `min_gain` quality points, or when that gain costs more than
+    `seconds_per_point` seconds per point. Expected gain is the last observed
+    gain times `decay` (diminishing returns), or half the remaining headroom
+    before any revision has been scored. An unparseable critique is its own
+    outcome and never triggers a blind revision.
+    """
+
+    target_quality: float = 4.0
+    max_quality: float = 5.0
+    min_gain: float = 0.5
+    seconds_per_point: Optional[float] = None
+    decay: float = 0.5
+    rounds: List[CritiqueRound] = field(default_factory=list)
+
+    def _last_scored(self) -> Optional[CritiqueRound]:
+        for r in reversed(self.rounds):
+            if r.quality is not None:
+                return r
+        return None
+
+    def expected_gain(self, quality: float, delta: Optional[float] = None) -> float:
+        """Quality points one more revision should add, given the gain `delta` just measured.
+
+        >>> c = CritiqueController()
+        >>> c.observe({"quality": 3, "issues": ["thin"]}).decision
+        'revise'
+        >>> c.expected_gain(3.6, 0.6)
+        0.3
+        >>> c.observe({"quality": 3.6, "issues": ["thin"]}).decision
+        'low_gain'
+        """
+        if delta is not None and delta > 0:
+            gain = delta * self.decay
+        else:
+            # No revision scored yet: assume half the remaining headroom.
+            gain = (self.max_quality - quality) * self.decay
+        return max(0.0, min(gain, self.max_quality - quality))
+
+    def observe(
+        self,
+        critique: Optional[Dict[str, Any]],
+        expected_seconds: float = 0.0,
+    ) -> CritiqueRound:
+        """Record one critic reply; `expected_seconds` estimates the next revision's latency."""
+        iteration = len(self.rounds) + 1
+        if critique is None:
+            round_ = CritiqueRound(iteration, None, None, 0, False, UNPARSEABLE)
+            self.rounds.append(round_)
+            return round_
+
+        issues = len(critique.get("issues", []) or [])
+        quality = critique_quality(critique)
+        prev = self._last_scored()
+        delta = quality - prev.quality if quality is not None and prev is not None else None
+
+        if quality is None:
+            decision = REVISE if issues else UNPARSEABLE
+        elif not issues and quality >= self.target_quality:
+            decision = ACCEPTED
+        elif delta is not None and delta < 0:
+            decision = REGRESSED
+        elif delta is not None and delta < self.min_gain:
+            decision = PLATEAU
+        else:
+            gain = self.expected_gain(quality, delta)
+            if gain < self.min_gain:
+                decision = LOW_GAIN
+            elif self.seconds_per_point is not None and gain > 0 and expected_seconds / gain > self.seconds_per_point:
+                decision = TOO_COSTLY
+            else:
+                decision = REVISE
+        round_ = CritiqueRound(iteration, quality, delta, issues, True, decision)
+        self.rounds.append(round_)
+        return round_
+
+    def best_iteration(self) -> Optional[int]:
+        scored = [r for r in self.rounds if r.quality is not None]
+        if not scored:
+            return None
+        # Latest round wins ties so a revision that held quality is kept.
+        return max(scored, key=lambda r: (r.quality, r.iteration)).iteration
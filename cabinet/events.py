@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, ClassVar, Dict, Optional
+
+from .blackboard import StepResult
+from .agents import Plan
+
+if TYPE_CHECKING:
+    from .orchestrator import CabinetResult
+
+
+@dataclass(kw_only=True)
+class CabinetEvent:
+    kind: ClassVar[str] = "event"
+    # Wall-clock time the event was emitted, and seconds since the query started.
+    timestamp: float = field(default_factory=time.time)
+    elapsed: float = 0.0
+
+
+@dataclass(kw_only=True)
+class RoutingDecided(CabinetEvent):
+    kind: ClassVar[str] = "routing"
+    role_models: Dict[str, str]
+    decided: bool = True
+
+
+@dataclass(kw_only=True)
+class PlanReady(CabinetEvent):
+    kind: ClassVar[str] = "plan"
+    plan: Plan
+
+
+@dataclass(kw_only=True)
+class StepStarted(CabinetEvent):
+    kind: ClassVar[str] = "step_started"
+    step_id: str
+    agent: str
+    objective: str
+
+
+@dataclass(kw_only=True)
+class StepFinished(CabinetEvent):
+    kind: ClassVar[str] = "step_finished"
+    result: StepResult
+    duration: float = 0.0
+
+
+@dataclass(kw_only=True)
+class DraftReady(CabinetEvent):
+    kind: ClassVar[str] = "draft"
+    draft: str
+
+
+@dataclass(kw_only=True)
+class CritiqueReady(CabinetEvent):
+    kind: ClassVar[str] = "critique"
+    iteration: int
+    critique: Dict[str, Any]
+    revised: Optional[str] = None
+    # Controller verdict for this round: "revise", or why the loop stops (see cabinet.critique).
+    decision: str = ""
+
+
+@dataclass(kw_only=True)
+class FinalAnswer(CabinetEvent):
+    kind: ClassVar[str] = "final"
+    result: "CabinetResult"
@@ -0,0 +1,419 @@
+from __future__ import annotations
+
+import math
+import os
+import sqlite3
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from .orchestrator import CabinetResult
+
+
+# Latencies are stored as log-scale bucket ids (5% wide) next to the raw value, so
+# percentiles come from a GROUP BY over small histograms instead of sorting every row.
+_BUCKET_BASE = 1.05
+_LOG_BASE = math.log(_BUCKET_BASE)
+# Stage and call histograms are also rolled up per hour as runs are recorded; reports
+# read whole hours from the rollups and only scan raw rows at the window's ragged edges.
+_HOUR = 3600.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    query TEXT NOT NULL,
+    total_ms REAL NOT NULL,
+    bucket INTEGER NOT NULL,
+    iterations INTEGER NOT NULL,
+    steps INTEGER NOT NULL,
+    quality REAL,
+    calls INTEGER NOT NULL,
+    fallbacks INTEGER NOT NULL,
+    retries INTEGER NOT NULL,
+    stop_reason TEXT
+);
+CREATE INDEX IF NOT EXISTS runs_ts ON runs (ts);
+CREATE TABLE IF NOT EXISTS stages (
+    run_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    stage TEXT NOT NULL,
+    ms REAL NOT NULL,
+    bucket INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS stages_ts ON stages (ts, stage, bucket);
+CREATE TABLE IF NOT EXISTS calls (
+    run_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    stage TEXT NOT NULL,
+    role TEXT NOT NULL,
+    model TEXT NOT NULL,
+    ms REAL NOT NULL,
+    bucket INTEGER NOT NULL,
+    ok INTEGER NOT NULL,
+    fallback INTEGER NOT NULL,
+    attempts INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calls_ts ON calls (ts, role, model, bucket, ok, fallback, attempts);
+CREATE TABLE IF NOT EXISTS critique_rounds (
+    run_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    iteration INTEGER NOT NULL,
+    quality REAL,
+    delta REAL,
+    parsed INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    decision TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS critique_rounds_ts ON critique_rounds (ts, iteration);
+CREATE TABLE IF NOT EXISTS stage_rollup (
+    hour INTEGER NOT NULL,
+    stage TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    PRIMARY KEY (hour, stage, bucket)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS call_rollup (
+    hour INTEGER NOT NULL,
+    role TEXT NOT NULL,
+    model TEXT NOT NULL,
+    bucket INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    fallbacks INTEGER NOT NULL,
+    retried INTEGER NOT NULL,
+    failed INTEGER NOT NULL,
+    PRIMARY KEY (hour, role, model, bucket)
+) WITHOUT ROWID;
+"""
+
+_BACKFILL = """
+INSERT INTO stage_rollup (hour, stage, bucket, n)
+SELECT CAST(ts / 3600 AS INTEGER), stage, bucket, COUNT(*) FROM stages GROUP BY 1, 2, 3;
+INSERT INTO call_rollup (hour, role, model, bucket, n, fallbacks, retried, failed)
+SELECT CAST(ts / 3600 AS INTEGER), role, model, bucket, COUNT(*), SUM(fallback > 0), SUM(attempts > 1), SUM(ok = 0)
+FROM calls GROUP BY 1, 2, 3, 4;
+"""
+
+
+def _bucket(ms: float) -> int:
+    return int(math.log(max(ms, 1.0)) / _LOG_BASE)
+
+
+def _bucket_value(bucket: int) -> float:
+    return _BUCKET_BASE ** (bucket + 0.5)
+
+
+def _percentiles(hist: Dict[int, int], qs: Iterable[float] = (0.5, 0.95, 0.99)) -> Dict[str, float]:
+    total = sum(hist.values())
+    out: Dict[str, float] = {}
+    if not total:
+        return out
+    ordered = sorted(hist.items())
+    for q in qs:
+        target = q * total
+        seen = 0
+        for b, n in ordered:
+            seen += n
+            if seen >= target:
+                out[f"p{int(round(q * 100))}"] = round(_bucket_value(b), 1)
+                break
+    out["count"] = total
+    return out
+
+
+def _split_window(since: float, until: float) -> Tuple[Optional[Tuple[int, int]], List[Tuple[float, float]]]:
+    # Whole hours [lo, hi) inside [since, until] and the half-open raw ranges around them.
+    end = math.nextafter(until, math.inf)
+    lo, hi = math.ceil(since / _HOUR), math.floor(end / _HOUR)
+    if lo >= hi:
+        return None, [(since, end)]
+    return (lo, hi), [(since, lo * _HOUR), (hi * _HOUR, end)]
+
+
+def _default_path() -> str:
+    env = os.environ.get("CABINET_HISTORY_DB")
+    if env:
+        return env
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return os.path.join(base, "cabinet", "history.sqlite3")
+
+
+class RunHistory:
+    """Append-only SQLite store of finished runs and their LLM calls.
+
+    Rows older than `retention_days` are pruned every `prune_every` records.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        retention_days: float = 30.0,
+        prune_every: int = 500,
+    ) -> None:
+        self.path = path or _default_path()
+        self.retention_days = float(retention_days)
+        self.prune_every = max(1, int(prune_every))
+        self._lock = threading.Lock()
+        self._since_prune = 0
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        tables = {row[0] for row in self._conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self._conn.executescript(_SCHEMA)
+        if "call_rollup" not in tables:
+            # Databases written before the rollups existed.
+            with self._conn:
+                self._conn.executescript(_BACKFILL)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(runs)")}
+        if "stop_reason" not in columns:
+            # Databases written before the column existed.
+            self._conn.execute("ALTER TABLE runs ADD COLUMN stop_reason TEXT")
+
+    def record(self, result: "CabinetResult", ts: Optional[float] = None) -> int:
+        ts = time.time() if ts is None else ts
+        calls = result.calls or []
+        quality = (result.critique or {}).get("quality")
+        total_ms = float(result.timings.get("total", 0.0)) * 1000.0
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO runs"
+                " (ts, query, total_ms, bucket, iterations, steps, quality, calls, fallbacks, retries, stop_reason)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    ts,
+                    result.query,
+                    total_ms,
+                    _bucket(total_ms),
+                    int(result.iterations),
+                    len(result.step_outputs),
+                    float(quality) if isinstance(quality, (int, float)) else None,
+                    len(calls),
+                    sum(1 for c in calls if c.fallback > 0),
+                    sum(max(0, c.attempts - 1) for c in calls),
+                    result.stop_reason or None,
+                ),
+            )
+            run_id = int(cur.lastrowid)
+            self._conn.executemany(
+                "INSERT INTO stages (run_id, ts, stage, ms, bucket) VALUES (?, ?, ?, ?, ?)",
+                [(run_id, ts, stage, sec * 1000.0, _bucket(sec * 1000.0)) for stage, sec in result.timings.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO calls (run_id, ts, stage, role, model, ms, bucket, ok, fallback, attempts)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        run_id,
+                        c.started,
+                        c.stage,
+                        c.role,
+                        c.model,
+                        c.latency * 1000.0,
+                        _bucket(c.latency * 1000.0),
+                        int(c.ok),
+                        c.fallback,
+                        c.attempts,
+                    )
+                    for c in calls
+                ],
+            )
+            stage_rollup: Dict[Tuple[int, str, int], int] = {}
+            for stage, sec in result.timings.items():
+                key = (int(ts // _HOUR), stage, _bucket(sec * 1000.0))
+                stage_rollup[key] = stage_rollup.get(key, 0) + 1
+            self._conn.executemany(
+                "INSERT INTO stage_rollup (hour, stage, bucket, n) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (hour, stage, bucket) DO UPDATE SET n = n + excluded.n",
+                [(*key, n) for key, n in stage_rollup.items()],
+            )
+            call_rollup: Dict[Tuple[int, str, str, int], List[int]] = {}
+            for c in calls:
+                agg = call_rollup.setdefault(
+                    (int(c.started // _HOUR), c.role, c.model, _bucket(c.latency * 1000.0)), [0, 0, 0, 0]
+                )
+                agg[0] += 1
+                agg[1] += int(c.fallback > 0)
+                agg[2] += int(c.attempts > 1)
+                agg[3] += int(not c.ok)
+            self._conn.executemany(
+                "INSERT INTO call_rollup (hour, role, model, bucket, n, fallbacks, retried, failed)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT (hour, role, model, bucket) DO UPDATE SET"
+                " n = n + excluded.n, fallbacks = fallbacks + excluded.fallbacks,"
+                " retried = retried + excluded.retried, failed = failed + excluded.failed",
+                [(*key, *agg) for key, agg in call_rollup.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO critique_rounds (run_id, ts, iteration, quality, delta, parsed, seconds, decision)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (run_id, ts, r.iteration, r.quality, r.delta, int(r.parsed), r.seconds, r.decision)
+                    for r in result.critique_rounds
+                ],
+            )
+            self._since_prune += 1
+            if self._since_prune >= self.prune_every:
+                self._since_prune = 0
+                self._prune_locked(ts - self.retention_days * 86400.0)
+        return run_id
+
+    def _prune_locked(self, cutoff: float) -> None:
+        for table in ("calls", "stages", "critique_rounds", "runs"):
+            self._conn.execute(f"DELETE FROM {table} WHERE ts < ?", (cutoff,))
+        # Rollups keep the hour the cutoff falls in; reports never reach that far back.
+        for table in ("stage_rollup", "call_rollup"):
+            self._conn.execute(f"DELETE FROM {table} WHERE hour < ?", (int(cutoff // _HOUR),))
+
+    def prune(self, cutoff: Optional[float] = None) -> None:
+        cutoff = time.time() - self.retention_days * 86400.0 if cutoff is None else cutoff
+        with self._lock, self._conn:
+            self._prune_locked(cutoff)
+
+    def stats(self, since: float = 0.0, until: Optional[float] = None, slowest: int = 10) -> Dict[str, Any]:
+        until = time.time() if until is None else until
+        window = (since, until)
+        hours, edges = _split_window(since, until)
+        with self._lock:
+            stage_rows: List[Tuple[Any, ...]] = []
+            rows: List[Tuple[Any, ...]] = []
+            if hours is not None:
+                stage_rows += self._conn.execute(
+                    "SELECT stage, bucket, SUM(n) FROM stage_rollup WHERE hour >= ? AND hour < ?"
+                    " GROUP BY stage, bucket",
+                    hours,
+                ).fetchall()
+                rows += self._conn.execute(
+                    "SELECT role, model, bucket, SUM(n), SUM(fallbacks), SUM(retried), SUM(failed)"
+                    " FROM call_rollup WHERE hour >= ? AND hour < ? GROUP BY role, model, bucket",
+                    hours,
+                ).fetchall()
+            for edge in edges:
+                stage_rows += self._conn.execute(
+                    "SELECT stage, bucket, COUNT(*) FROM stages WHERE ts >= ? AND ts < ? GROUP BY stage, bucket", edge
+                ).fetchall()
+                rows += self._conn.execute(
+                    "SELECT role, model, bucket, COUNT(*), SUM(fallback > 0), SUM(attempts > 1), SUM(ok = 0)"
+                    " FROM calls WHERE ts >= ? AND ts < ? GROUP BY role, model, bucket",
+                    edge,
+                ).fetchall()
+
+            stage_hist: Dict[str, Dict[int, int]] = {}
+            for stage, bucket, n in stage_rows:
+                sh = stage_hist.setdefault(stage, {})
+                sh[bucket] = sh.get(bucket, 0) + n
+
+            role_hist: Dict[str, Dict[int, int]] = {}
+            model_hist: Dict[str, Dict[int, int]] = {}
+            calls = fallbacks = retried = failed = 0
+            for role, model, bucket, n, fb, rt, bad in rows:
+                rh = role_hist.setdefault(role, {})
+                rh[bucket] = rh.get(bucket, 0) + n
+                mh = model_hist.setdefault(model, {})
+                mh[bucket] = mh.get(bucket, 0) + n
+                calls += n
+                fallbacks += fb or 0
+                retried += rt or 0
+                failed += bad or 0
+
+            runs, avg_iter, avg_quality = self._conn.execute(
+                "SELECT COUNT(*), AVG(iterations), AVG(quality) FROM runs WHERE ts BETWEEN ? AND ?", window
+            ).fetchone()
+            # What each extra critique round bought: mean quality change since the previous round.
+            rounds = self._conn.execute(
+                "SELECT iteration, COUNT(*), AVG(quality), AVG(delta), SUM(parsed = 0), AVG(seconds)"
+                " FROM critique_rounds WHERE ts BETWEEN ? AND ? GROUP BY iteration ORDER BY iteration",
+                window,
+            ).fetchall()
+            stops = self._conn.execute(
+                "SELECT stop_reason, COUNT(*) FROM runs"
+                " WHERE ts BETWEEN ? AND ? AND stop_reason IS NOT NULL GROUP BY stop_reason",
+                window,
+            ).fetchall()
+            slow = self._conn.execute(
+                "SELECT ts, total_ms, iterations, query FROM runs WHERE ts BETWEEN ? AND ?"
+                " ORDER BY total_ms DESC LIMIT ?",
+                (since, until, int(slowest)),
+            ).fetchall()
+
+        return {
+            "window": {"since": since, "until": until},
+            "runs": runs or 0,
+            "avg_iterations": round(avg_iter, 2) if avg_iter is not None else None,
+            "avg_quality": round(avg_quality, 2) if avg_quality is not None else None,
+            "calls": calls,
+            "fallback_rate": (fallbacks / calls) if calls else 0.0,
+            "retry_rate": (retried / calls) if calls else 0.0,
+            "error_rate": (failed / calls) if calls else 0.0,
+            "stage_ms": {k: _percentiles(v) for k, v in sorted(stage_hist.items())},
+            "role_ms": {k: _percentiles(v) for k, v in sorted(role_hist.items())},
+            "model_ms": {k: _percentiles(v) for k, v in sorted(model_hist.items())},
+            "critique_rounds": [
+                {
+                    "iteration": it,
+                    "count": n,
+                    "avg_quality": round(q, 2) if q is not None else None,
+                    "avg_delta": round(d, 2) if d is not None else None,
+                    "unparsed": bad or 0,
+                    "avg_seconds": round(sec or 0.0, 2),
+                }
+                for it, n, q, d, bad, sec in rounds
+            ],
+            "critique_stops": {decision: n for decision, n in stops},
+            "slowest": [
+                {"ts": ts, "total_ms": round(ms, 1), "iterations": it, "query": q[:120]} for ts, ms, it, q in slow
+            ],
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def parse_window(text: str) -> float:
+    """Turn '90m', '24h', '7d' or plain seconds into a number of seconds."""
+    text = text.strip().lower()
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 604800}
+    if text and text[-1] in units:
+        return float(text[:-1]) * units[text[-1]]
+    return float(text)
+
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    lines: List[str] = []
+    lines.append(
+        f"Runs: {stats['runs']}  calls: {stats['calls']}  avg iterations: {stats['avg_iterations']}"
+        f"  avg quality: {stats['avg_quality']}"
+    )
+    lines.append(
+        f"Fallback rate: {stats['fallback_rate']:.1%}  retry rate: {stats['retry_rate']:.1%}"
+        f"  error rate: {stats['error_rate']:.1%}"
+    )
+    for title, key in (("Stage", "stage_ms"), ("Role", "role_ms"), ("Model", "model_ms")):
+        if not stats[key]:
+            continue
+        lines.append("")
+        lines.append(f"{title:<40} {'count':>8} {'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}")
+        for name, p in stats[key].items():
+            lines.append(
+                f"{name[:40]:<40} {p.get('count', 0):>8} {p.get('p50', 0):>10.0f} {p.get('p95', 0):>10.0f} {p.get('p99', 0):>10.0f}"
+            )
+    if stats.get("critique_rounds"):
+        lines.append("")
+        lines.append(f"{'Critique round':<40} {'count':>8} {'quality':>10} {'gain':>10} {'unparsed':>10} {'avg s':>8}")
+        for row in stats["critique_rounds"]:
+            q = "-" if row["avg_quality"] is None else f"{row['avg_quality']:.2f}"
+            d = "-" if row["avg_delta"] is None else f"{row['avg_delta']:+.2f}"
+            lines.append(
+                f"{row['iteration']:<40} {row['count']:>8} {q:>10} {d:>10} {row['unparsed']:>10} {row['avg_seconds']:>8.2f}"
+            )
+        stops = ", ".join(f"{k}={v}" for k, v in sorted(stats["critique_stops"].items()))
+        lines.append(f"Critique stop reasons: {stops}")
+    if stats["slowest"]:
+        lines.append("")
+        lines.append("Slowest queries:")
+        for row in stats["slowest"]:
+            when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["ts"]))
+            lines.append(f"- {when}  {row['total_ms'] / 1000.0:7.2f}s  it={row['iterations']}  {row['query']}")
+    return "\n".join(lines)
+
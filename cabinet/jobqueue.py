@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional
+
+
+@dataclass
+class Job:
+    id: str
+    query: str
+    params: Dict[str, Any] = field(default_factory=dict)
+    attempts: int = 0
+    lease_token: Optional[str] = None
+    lease_expires: float = 0.0
+
+
+class JobQueue(ABC):
+    """Durable queue of Cabinet queries with leases.
+
+    A leased job is invisible to other workers until its lease expires. A worker
+    that dies simply stops heartbeating, and the job is handed out again (up to
+    `max_attempts`). Completion and failure are accepted only from the current
+    lease holder, so a worker that lost its lease cannot overwrite a newer attempt.
+    """
+
+    @abstractmethod
+    def enqueue(self, query: str, params: Optional[Dict[str, Any]] = None, max_attempts: Optional[int] = None) -> str:
+        ...
+
+    @abstractmethod
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        ...
+
+    @abstractmethod
+    def heartbeat(self, job: Job, visibility_timeout: float) -> bool:
+        ...
+
+    @abstractmethod
+    def complete(self, job: Job, result: Dict[str, Any]) -> bool:
+        ...
+
+    @abstractmethod
+    def fail(self, job: Job, error: str) -> bool:
+        ...
+
+    @abstractmethod
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    def counts(self) -> Dict[str, int]:
+        ...
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    query TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_token TEXT,
+    lease_expires REAL NOT NULL DEFAULT 0,
+    created REAL NOT NULL,
+    updated REAL NOT NULL,
+    result TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS jobs_ready ON jobs (status, lease_expires, created);
+"""
+
+
+class SQLiteJobQueue(JobQueue):
+    """JobQueue in a single SQLite file, safe for many worker processes on one host."""
+
+    def __init__(self, path: str, max_attempts: int = 3) -> None:
+        self.path = path
+        self.max_attempts = max(1, int(max_attempts))
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._conn()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        # One connection per thread (heartbeats run on their own thread); autocommit
+        # mode so claims can use explicit BEGIN IMMEDIATE transactions.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30.0, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout=30000")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def enqueue(self, query: str, params: Optional[Dict[str, Any]] = None, max_attempts: Optional[int] = None) -> str:
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        self._conn().execute(
+            "INSERT INTO jobs (id, query, params, status, max_attempts, created, updated) VALUES (?, ?, ?, 'queued', ?, ?, ?)",
+            (job_id, query, json.dumps(params or {}), int(max_attempts or self.max_attempts), now, now),
+        )
+        return job_id
+
+    def lease(self, worker_id: str, visibility_timeout: float) -> Optional[Job]:
+        conn = self._conn()
+        now = time.time()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Expired leases that already used every attempt are dead, not retryable.
+            conn.execute(
+                "UPDATE jobs SET status = 'failed', error = COALESCE(error, 'lease expired'), updated = ?"
+                " WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+                (now, now),
+            )
+            row = conn.execute(
+                "SELECT id, query, params, attempts FROM jobs"
+                " WHERE status = 'queued' OR (status = 'leased' AND lease_expires < ?)"
+                " ORDER BY created LIMIT 1",
+                (now,),
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            token = uuid.uuid4().hex
+            expires = now + visibility_timeout
+            conn.execute(
+                "UPDATE jobs SET status = 'leased', attempts = attempts + 1, lease_owner = ?, lease_token = ?,"
+                " lease_expires = ?, updated = ? WHERE id = ?",
+                (worker_id, token, expires, now, row[0]),
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return Job(
+            id=row[0],
+            query=row[1],
+            params=json.loads(row[2] or "{}"),
+            attempts=int(row[3]) + 1,
+            lease_token=token,
+            lease_expires=expires,
+        )
+
+    def heartbeat(self, job: Job, visibility_timeout: float) -> bool:
+        now = time.time()
+        cur = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ?, updated = ? WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            (now + visibility_timeout, now, job.id, job.lease_token),
+        )
+        if cur.rowcount:
+            job.lease_expires = now + visibility_timeout
+        return cur.rowcount > 0
+
+    def complete(self, job: Job, result: Dict[str, Any]) -> bool:
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = 'done', result = ?, error = NULL, lease_token = NULL, updated = ?"
+            " WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            (json.dumps(result), time.time(), job.id, job.lease_token),
+        )
+        return cur.rowcount > 0
+
+    def fail(self, job: Job, error: str) -> bool:
+        # Back to the queue while attempts remain, otherwise terminally failed.
+        cur = self._conn().execute(
+            "UPDATE jobs SET status = CASE WHEN attempts < max_attempts THEN 'queued' ELSE 'failed' END,"
+            " error = ?, lease_token = NULL, lease_expires = 0, updated = ?"
+            " WHERE id = ? AND status = 'leased' AND lease_token = ?",
+            (error, time.time(), job.id, job.lease_token),
+        )
+        return cur.rowcount > 0
+
+    def result(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn().execute("SELECT result FROM jobs WHERE id = ? AND status = 'done'", (job_id,)).fetchone()
+        return json.loads(row[0]) if row and row[0] else None
+
+    def iter_results(self) -> Iterator[Dict[str, Any]]:
+        rows = self._conn().execute(
+            "SELECT id, query, status, attempts, result, error FROM jobs WHERE status IN ('done', 'failed') ORDER BY created"
+        )
+        for job_id, query, status, attempts, result, error in rows:
+            yield {
+                "id": job_id,
+                "query": query,
+                "status": status,
+                "attempts": attempts,
+                "result": json.loads(result) if result else None,
+                "error": error,
+            }
+
+    def counts(self) -> Dict[str, int]:
+        now = time.time()
+        out = {"queued": 0, "leased": 0, "expired": 0, "done": 0, "failed": 0}
+        for status, expired, n in self._conn().execute(
+            "SELECT status, status = 'leased' AND lease_expires < ?, COUNT(*) FROM jobs GROUP BY 1, 2", (now,)
+        ):
+            out["expired" if expired else status] = out.get("expired" if expired else status, 0) + n
+        return out
+
+    def job_ids(self, status: Optional[str] = None) -> List[str]:
+        if status:
+            rows = self._conn().execute("SELECT id FROM jobs WHERE status = ? ORDER BY created", (status,))
+        else:
+            rows = self._conn().execute("SELECT id FROM jobs ORDER BY created")
+        return [r[0] for r in rows]
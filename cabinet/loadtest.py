@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+
+from .orchestrator import Cabinet
+
+
+_ROLES = ("researcher", "engineer", "analyst")
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    server: "StubServer"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: Dict[str, Any]) -> None:
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self) -> None:
+        if self.path.rstrip("/").endswith("/models"):
+            self._send(200, {"data": [{"id": "gpt-4o-mini"}]})
+        else:
+            self._send(404, {"error": {"message": "not found"}})
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            payload = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send(400, {"error": {"message": "invalid JSON"}})
+            return
+        messages = payload.get("messages") or []
+        system = messages[0].get("content", "") if messages and messages[0].get("role") == "system" else ""
+        self.server.delay()
+        self._send(200, {"choices": [{"message": {"role": "assistant", "content": self.server.reply(system)}}]})
+
+
+class StubServer(ThreadingHTTPServer):
+    """OpenAI-compatible stand-in that answers every role with canned content after a set delay.
+
+    Planner and decider get valid JSON, the critic accepts every answer, and
+    everything else gets `reply_words` words of filler, so a run exercises the
+    full pipeline at a known upstream latency.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.2,
+        jitter: float = 0.1,
+        steps: int = 3,
+        reply_words: int = 200,
+    ) -> None:
+        super().__init__((host, port), _StubHandler)
+        self.latency = max(0.0, float(latency))
+        self.jitter = max(0.0, float(jitter))
+        self.steps = max(1, int(steps))
+        self.reply_words = max(1, int(reply_words))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def delay(self) -> None:
+        time.sleep(self.latency + random.uniform(0.0, self.jitter))
+
+    def reply(self, system: str) -> str:
+        if "Planner" in system:
+            steps = [
+                {"id": f"s{i + 1}", "agent": _ROLES[i % len(_ROLES)], "objective": f"part {i + 1}", "guidance": ""}
+                for i in range(self.steps)
+            ]
+            return json.dumps({"steps": steps})
+        if "Model Decider" in system:
+            return json.dumps({"role_models": {}})
+        if "Critic" in system:
+            return json.dumps({"quality": 5, "issues": [], "suggested_fixes": []})
+        return " ".join(f"word{i % 97}" for i in range(self.reply_words))
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="cabinet-stub-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+def _rss_mb() -> float:
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, IndexError):
+        import resource
+
+        # No /proc (e.g. macOS): fall back to the peak, reported in bytes there and KiB elsewhere.
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1e6 if sys.platform == "darwin" else peak / 1024.0
+
+
+class _Sampler(threading.Thread):
+    # Peak thread count and RSS while one concurrency level runs.
+    def __init__(self, interval: float = 0.05) -> None:
+        super().__init__(name="cabinet-loadtest-sampler", daemon=True)
+        self.interval = interval
+        self.peak_threads = threading.active_count()
+        self.peak_rss = _rss_mb()
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        while not self._halt.wait(self.interval):
+            self.peak_threads = max(self.peak_threads, threading.active_count())
+            self.peak_rss = max(self.peak_rss, _rss_mb())
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))]
+
+
+def run_level(
+    make_cabinet: Callable[[], Cabinet],
+    concurrency: int,
+    requests: int,
+    parallel: bool = True,
+    max_iterations: int = 2,
+) -> Dict[str, Any]:
+    """Run `requests` queries with `concurrency` callers sharing one Cabinet."""
+    cabinet = make_cabinet()
+    latencies: List[float] = []
+    calls: List[int] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def one(i: int) -> None:
+        started = time.perf_counter()
+        try:
+            result = cabinet.answer(f"Load test question {i}", parallel=parallel, max_iterations=max_iterations)
+        except Exception as e:
+            with lock:
+                errors.append(f"{type(e).__name__}: {e}")
+            return
+        elapsed = time.perf_counter() - started
+        with lock:
+            latencies.append(elapsed)
+            calls.append(len(result.calls))
+
+    sampler = _Sampler()
+    sampler.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cabinet-loadtest") as ex:
+        list(ex.map(one, range(requests)))
+    wall = time.perf_counter() - started
+    sampler.stop()
+
+    ordered = sorted(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": requests,
+        "ok": len(latencies),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "seconds": round(wall, 3),
+        "throughput_qps": round(len(latencies) / wall, 3) if wall > 0 else 0.0,
+        "llm_calls_per_s": round(sum(calls) / wall, 2) if wall > 0 else 0.0,
+        "p50_ms": round(_percentile(ordered, 0.50) * 1000.0, 1),
+        "p95_ms": round(_percentile(ordered, 0.95) * 1000.0, 1),
+        "p99_ms": round(_percentile(ordered, 0.99) * 1000.0, 1),
+        "peak_threads": sampler.peak_threads,
+        "peak_rss_mb": round(sampler.peak_rss, 1),
+    }
+
+
+def run_loadtest(
+    make_cabinet: Callable[[], Cabinet],
+    levels: List[int],
+    requests_per_level: int,
+    parallel: bool = True,
+    max_iterations: int = 2,
+    on_level: Optional[Callable[[Dict[str, Any]], None]] = None,
+) -> List[Dict[str, Any]]:
+    rows: List[Dict[str, Any]] = []
+    for level in levels:
+        row = run_level(
+            make_cabinet,
+            concurrency=max(1, int(level)),
+            requests=max(int(level), int(requests_per_level)),
+            parallel=parallel,
+            max_iterations=max_iterations,
+        )
+        rows.append(row)
+        if on_level is not None:
+            on_level(row)
+    return rows
+
+
+REPORT_COLUMNS = (
+    "concurrency",
+    "ok",
+    "errors",
+    "throughput_qps",
+    "llm_calls_per_s",
+    "p50_ms",
+    "p95_ms",
+    "p99_ms",
+    "peak_threads",
+    "peak_rss_mb",
+)
+
+
+def format_row(row: Dict[str, Any]) -> str:
+    return " ".join(f"{row[c]:>{max(len(c), 8)}}" for c in REPORT_COLUMNS)
+
+
+def format_header() -> str:
+    return " ".join(f"{c:>{max(len(c), 8)}}" for c in REPORT_COLUMNS)
+
+
+def write_report(rows: List[Dict[str, Any]], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        if path.endswith(".csv"):
+            f.write(",".join(REPORT_COLUMNS) + "\n")
+            for row in rows:
+                f.write(",".join(str(row[c]) for c in REPORT_COLUMNS) + "\n")
+        else:
+            json.dump(rows, f, indent=2)
@@ -31,3 +31,20 @@ class ChatHistory:
         ch.messages = list(self.messages)
         return ch
 
+    def compacted(self, max_chars: int = 6000, max_message_chars: int = 1500) -> List[Dict[str, str]]:
+        # Most recent messages first, each clipped, until the budget is spent.
+        out: List[Dict[str, str]] = []
+        used = 0
+        for m in reversed(self.messages):
+            content = m.content
+            if len(content) > max_message_chars:
+                content = content[: max_message_chars - 3].rstrip() + "..."
+            if out and used + len(content) > max_chars:
+                break
+            out.append({"role": m.role, "content": content})
+            used += len(content)
+        out.reverse()
+        # Chat APIs expect the history to open with a user turn.
+        while out and out[0]["role"] != "user":
+            out.pop(0)
+        return out
@@ -3,7 +3,90 @@ from __future__ import annotations
 import json
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Optional, List
+from typing import Any, Dict, Optional, List
+
+
+# Models known to accept `response_format: {"type": "json_object"}`.
+JSON_MODE_MODEL_PREFIXES = ("gpt-4o", "gpt-4.1", "gpt-4-turbo", "gpt-3.5-turbo", "o1", "o3", "o4")
+
+
+def supports_json_mode(model: str) -> bool:
+    return str(model).lower().startswith(JSON_MODE_MODEL_PREFIXES)
+
+
+@dataclass
+class GenerationConfig:
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    stop: Optional[List[str]] = None
+    json_mode: Optional[bool] = None
+    # Per-attempt HTTP timeouts in seconds; unset falls back to per-model / env defaults.
+    connect_timeout: Optional[float] = None
+    read_timeout: Optional[float] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "GenerationConfig":
+        stop = data.get("stop")
+        if isinstance(stop, str):
+            stop = [stop]
+        return cls(
+            max_tokens=int(data["max_tokens"]) if data.get("max_tokens") is not None else None,
+            temperature=float(data["temperature"]) if data.get("temperature") is not None else None,
+            stop=[str(x) for x in stop] if stop else None,
+            json_mode=bool(data["json_mode"]) if data.get("json_mode") is not None else None,
+            connect_timeout=float(data["connect_timeout"]) if data.get("connect_timeout") is not None else None,
+            read_timeout=float(data["read_timeout"]) if data.get("read_timeout") is not None else None,
+        )
+
+    def merged(self, other: Optional["GenerationConfig"]) -> "GenerationConfig":
+        # Fields set on `other` win.
+        if other is None:
+            return self
+        return GenerationConfig(
+            max_tokens=other.max_tokens if other.max_tokens is not None else self.max_tokens,
+            temperature=other.temperature if other.temperature is not None else self.temperature,
+            stop=other.stop if other.stop is not None else self.stop,
+            json_mode=other.json_mode if other.json_mode is not None else self.json_mode,
+            connect_timeout=other.connect_timeout if other.connect_timeout is not None else self.connect_timeout,
+            read_timeout=other.read_timeout if other.read_timeout is not None else self.read_timeout,
+        )
+
+    def api_options(self, model: str) -> Dict[str, Any]:
+        opts: Dict[str, Any] = {}
+        if self.temperature is not None:
+            opts["temperature"] = self.temperature
+        if self.max_tokens is not None:
+            opts["max_tokens"] = self.max_tokens
+        if self.stop:
+            opts["stop"] = list(self.stop)
+        if self.json_mode and supports_json_mode(model):
+            opts["response_format"] = {"type": "json_object"}
+        if self.connect_timeout is not None:
+            opts["connect_timeout"] = self.connect_timeout
+        if self.read_timeout is not None:
+            opts["read_timeout"] = self.read_timeout
+        return opts
+
+
+# Roles that only emit short JSON get a tight budget and low temperature;
+# output length is the largest driver of per-call latency.
+DEFAULT_ROLE_GENERATION: Dict[str, GenerationConfig] = {
+    "decider": GenerationConfig(max_tokens=400, temperature=0.0, json_mode=True),
+    "planner": GenerationConfig(max_tokens=800, temperature=0.2, json_mode=True),
+    "critic": GenerationConfig(max_tokens=600, temperature=0.0, json_mode=True),
+    "condenser": GenerationConfig(max_tokens=1200, temperature=0.3),
+}
+
+
+def _load_generation_from_env() -> Dict[str, GenerationConfig]:
+    raw = os.environ.get("CABINET_GENERATION_MAP")
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+        return {str(k).lower(): GenerationConfig.from_dict(v) for k, v in data.items() if isinstance(v, dict)}
+    except Exception:
+        return {}
 
 
 def _load_map_from_env() -> Dict[str, str]:
@@ -31,6 +114,7 @@ class ModelRouter:
     default_model: str = "gpt-4o-mini"
     agent_models: Dict[str, str] = field(default_factory=dict)
     step_models: Dict[str, str] = field(default_factory=dict)
+    role_generation: Dict[str, GenerationConfig] = field(default_factory=lambda: dict(DEFAULT_ROLE_GENERATION))
 
     @classmethod
     def from_sources(
@@ -46,7 +130,9 @@ class ModelRouter:
             m.update({k: v for k, v in overrides.items() if v})
         # normalize keys to lowercase
         m = {str(k).lower(): str(v) for k, v in m.items()}
-        return cls(default_model=default_model, agent_models=m)
+        router = cls(default_model=default_model, agent_models=m)
+        router.role_generation.update(_load_generation_from_env())
+        return router
 
     def set_role_map(self, mapping: Dict[str, str]) -> None:
         self.agent_models.update({str(k).lower(): str(v) for k, v in mapping.items()})
@@ -54,6 +140,12 @@ class ModelRouter:
     def set_step_map(self, mapping: Dict[str, str]) -> None:
         self.step_models.update({str(k): str(v) for k, v in mapping.items()})
 
+    def set_generation(self, role: str, config: GenerationConfig) -> None:
+        self.role_generation[str(role).lower()] = config
+
+    def generation_for(self, role: str) -> Optional[GenerationConfig]:
+        return self.role_generation.get(str(role).lower())
+
     def for_agent(
         self,
         agent_name: str,
@@ -1,24 +1,79 @@
 from __future__ import annotations
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any
-import json
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple, Any, AsyncIterator, Callable, Iterator
+import asyncio
+import math
+import queue
+import re
+import threading
+import time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
 
-from .blackboard import Blackboard, StepResult
+from .blackboard import Blackboard, CallRecord, StepResult
 from .agents import (
     PlannerAgent,
     ResearcherAgent,
     EngineerAgent,
     AnalystAgent,
     SynthesizerAgent,
+    CondenserAgent,
     CriticAgent,
     ModelDeciderAgent,
     Plan,
     PlanStep,
 )
 from .models import ModelRouter
-from .api_client import ModelNotFoundError, LLMAPIError
+from .catalog import ModelCatalog
+from .concurrency import enable_adaptive_concurrency, get_limiter
+from .scheduler import INTERACTIVE, LlmScheduler
+from .synthesis import ProgressiveSynthesizer, content_words, novelty
+from .prompts import QueryPrompts
+from .critique import (
+    MAX_ITERATIONS,
+    PLATEAU,
+    REGRESSED,
+    REVISE,
+    UNPARSEABLE,
+    CritiqueController,
+    CritiqueRound,
+    parse_critique,
+)
+from .events import (
+    CabinetEvent,
+    RoutingDecided,
+    PlanReady,
+    StepStarted,
+    StepFinished,
+    DraftReady,
+    CritiqueReady,
+    FinalAnswer,
+)
+from .api_client import ModelNotFoundError, LLMAPIError, last_call_attempts
+from .cancellation import CancellationToken, QueryCancelled
+from .history import RunHistory
+from .answer_cache import AnswerCache
+from .session import CabinetSession, TurnContext
+
+
+# Tried, in order, after a role's own model and the default model.
+FALLBACK_MODELS = ["gpt-4o-mini", "claude-3-haiku-20240307", "gemini-1.5-flash-8b"]
+
+# Markdown structure for section critique: ATX headings and the fences of code blocks.
+_HEADING = re.compile(r"^ {0,3}#{1,6}(?:[ \t]|$)")
+_FENCE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_LEADING_BLANK_LINES = re.compile(r"(?:[ \t]*\n)*")
+
+_STAGE_BY_ROLE = {
+    "decider": "route",
+    "planner": "plan",
+    "researcher": "steps",
+    "engineer": "steps",
+    "analyst": "steps",
+    "condenser": "steps",
+    "synthesizer": "synthesize",
+    "critic": "critique",
+}
 
 
 @dataclass
@@ -30,6 +85,53 @@ class CabinetResult:
     final_answer: str
     critique: Optional[Dict[str, Any]] = None
     iterations: int = 1
+    # Seconds per stage (route, plan, steps, synthesize, critique, total) and one record per LLM call.
+    timings: Dict[str, float] = field(default_factory=dict)
+    calls: List[CallRecord] = field(default_factory=list)
+    cached: bool = False
+    # Team context the synthesizer saw (raw or condensed); sessions carry it into the next turn.
+    context_text: str = ""
+    # One entry per critic reply: quality, gain since the previous round and the controller's decision.
+    critique_rounds: List[CritiqueRound] = field(default_factory=list)
+    stop_reason: str = ""
+    # Speculative pre-draft outcome ("kept" or "revised"), stragglers and their novelty.
+    speculation: Optional[Dict[str, Any]] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CabinetResult":
+        plan = Plan(steps=[PlanStep(**s) for s in (data.get("plan") or {}).get("steps", [])])
+        return cls(
+            query=data["query"],
+            plan=plan,
+            step_outputs={k: StepResult(**v) for k, v in (data.get("step_outputs") or {}).items()},
+            draft_answer=data.get("draft_answer", ""),
+            final_answer=data.get("final_answer", ""),
+            critique=data.get("critique"),
+            iterations=int(data.get("iterations", 1)),
+            timings=dict(data.get("timings") or {}),
+            calls=[CallRecord(**c) for c in data.get("calls") or []],
+            cached=bool(data.get("cached", False)),
+            context_text=data.get("context_text", ""),
+            critique_rounds=[CritiqueRound(**r) for r in data.get("critique_rounds") or []],
+            stop_reason=data.get("stop_reason", ""),
+            speculation=data.get("speculation"),
+        )
+
+
+@dataclass
+class _QueryState:
+    # Per-query bookkeeping, passed down explicitly so concurrent answer() calls on one Cabinet stay apart.
+    # Every call, retry wait and queued step of the query checks `token`.
+    token: CancellationToken = field(default_factory=CancellationToken)
+    calls: List[CallRecord] = field(default_factory=list)
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+    def record(self, call: CallRecord) -> None:
+        with self.lock:
+            self.calls.append(call)
 
 
 class Cabinet:
@@ -42,6 +144,23 @@ class Cabinet:
         decider_model: Optional[str] = None,
         routing_goal: str = "balanced",
         max_workers: int = 4,
+        progressive_synthesis: bool = False,
+        coalesce_steps: bool = False,
+        max_coalesced_steps: int = 3,
+        section_critique: bool = False,
+        catalog: Optional[ModelCatalog] = None,
+        adaptive_concurrency: bool = False,
+        scheduler: Optional[LlmScheduler] = None,
+        tenant: Optional[str] = None,
+        priority: str = INTERACTIVE,
+        history: Optional[RunHistory] = None,
+        answer_cache: Optional[AnswerCache] = None,
+        critique_target: float = 4.0,
+        critique_min_gain: float = 0.5,
+        critique_seconds_per_point: Optional[float] = None,
+        speculative_fraction: Optional[float] = None,
+        speculative_deadline: float = 5.0,
+        speculative_novelty: float = 0.25,
     ) -> None:
         # Model routing
         self.model_router = router or ModelRouter.from_sources(
@@ -49,6 +168,8 @@ class Cabinet:
             overrides=(model_map or {}),
         )
         self.available_models = available_models or []
+        # Catalog refreshes filter this configured list, so a model that comes back is routable again.
+        self._configured_available = list(self.available_models)
         self.routing_goal = routing_goal
 
         # Core agents (constructed with default; overridden per-call by router)
@@ -58,10 +179,46 @@ class Cabinet:
         self.analyst = AnalystAgent(model=self.model_router.default_model)
         self.synthesizer = SynthesizerAgent(model=self.model_router.default_model)
         self.critic = CriticAgent(model=self.model_router.default_model)
+        self.condenser = CondenserAgent(model=self.model_router.default_model)
         self.decider = ModelDeciderAgent(model=decider_model or self.model_router.default_model)
 
         self.blackboard = Blackboard()
         self.max_workers = max(1, int(max_workers))
+        if adaptive_concurrency:
+            # The process-wide AIMD limiter gates requests; threads only need to cover its ceiling.
+            self.max_workers = max(self.max_workers, enable_adaptive_concurrency().max_limit)
+        # Fold each step into a running partial synthesis (cheap "condenser" role)
+        # so the final synthesizer call only sees condensed context.
+        self.progressive_synthesis = progressive_synthesis
+        # Merge steps for the same agent+model into one multi-part request.
+        self.coalesce_steps = coalesce_steps
+        self.max_coalesced_steps = max(1, int(max_coalesced_steps))
+        # Critique and repair the draft section by section, in parallel.
+        self.section_critique = section_critique
+        # Early exit for the critique loop: stop once another revision is not expected
+        # to add `critique_min_gain` quality points (or costs more than the latency budget).
+        self.critique_target = float(critique_target)
+        self.critique_min_gain = float(critique_min_gain)
+        self.critique_seconds_per_point = critique_seconds_per_point
+        # Start the synthesizer draft once this fraction of steps is done. Stragglers that
+        # finish within `speculative_deadline` seconds of that and add fewer than
+        # `speculative_novelty` new words are absorbed as is; otherwise a delta revision runs.
+        self.speculative_fraction = speculative_fraction
+        self.speculative_deadline = float(speculative_deadline)
+        self.speculative_novelty = float(speculative_novelty)
+        # Shared scheduler queues every LLM call by priority class and tenant; the tenant
+        # also names the project in the API auth header.
+        self.scheduler = scheduler
+        self.tenant = tenant
+        self.priority = priority
+        # Every finished run (timings + call metadata) is appended here when set.
+        self.history = history
+        # Near-duplicate questions under the same routing setup reuse a stored result.
+        self.answer_cache = answer_cache
+        self._configured_models = dict(self.model_router.agent_models)
+        # Filters available models and every fallback chain down to what the endpoint serves;
+        # checked before every query and refreshed once its TTL has expired.
+        self.catalog = catalog
 
         self._agent_map = {
             "researcher": self.researcher,
@@ -69,7 +226,49 @@ class Cabinet:
             "analyst": self.analyst,
         }
 
-    def _run_step(self, step: PlanStep, query: str) -> StepResult:
+    def session(self, **kwargs: Any) -> CabinetSession:
+        return CabinetSession(self, **kwargs)
+
+    @property
+    def concurrency_limit(self) -> Optional[int]:
+        limiter = get_limiter()
+        return limiter.limit if limiter is not None else None
+
+    def prepare_models(self, force: bool = False) -> None:
+        if self.catalog is None:
+            return
+        known = list(self._configured_available) + list(self.model_router.agent_models.values())
+        known += list(self.model_router.step_models.values())
+        known += [self.model_router.default_model, getattr(self.decider, "model", None)] + FALLBACK_MODELS
+        self.catalog.refresh(known, force=force)
+        # As in _candidates: if nothing survives, keep the configured list rather than disable routing.
+        self.available_models = self.catalog.filter(self._configured_available) or list(self._configured_available)
+
+    def _candidates(self, *preferred: Optional[str]) -> List[str]:
+        chain = list(preferred) + [self.model_router.default_model] + FALLBACK_MODELS
+        chain = [m for m in dict.fromkeys(chain) if m]
+        if self.catalog is None:
+            return chain
+        # If nothing survives the filter, let the calls themselves report the failure.
+        return self.catalog.filter(chain) or chain
+
+    def _cache_namespace(self, max_iterations: int) -> str:
+        return AnswerCache.namespace(
+            routing_goal=self.routing_goal,
+            available_models=sorted(self.available_models),
+            default_model=self.model_router.default_model,
+            role_models=self._configured_models,
+            max_iterations=max_iterations,
+            critique=[self.critique_target, self.critique_min_gain, self.critique_seconds_per_point],
+        )
+
+    def _run_step(
+        self,
+        state: _QueryState,
+        step: PlanStep,
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> StepResult:
         agent = self._agent_map.get(step.agent, self.researcher)
         prompt = (
             f"User request: {query}\n\n"
@@ -77,16 +276,92 @@ class Cabinet:
             f"Guidance: {step.guidance}"
         )
         primary = self.model_router.for_agent(step.agent, step.objective, step.guidance, step_id=step.id)
-        candidates = [
-            primary,
-            self.model_router.default_model,
-            "gpt-4o-mini",
-            "claude-3-haiku-20240307",
-            "gemini-1.5-flash-8b",
-        ]
-        output = self._try_run(agent, prompt, candidates)
+        candidates = self._candidates(primary)
+        output = self._try_run(state, agent, prompt, candidates, history=history)
         return StepResult(step_id=step.id, agent=step.agent, objective=step.objective, output=output)
 
+    def _group_steps(self, steps: List[PlanStep]) -> List[List[PlanStep]]:
+        if not self.coalesce_steps:
+            return [[s] for s in steps]
+        groups: List[List[PlanStep]] = []
+        open_groups: Dict[Tuple[str, str], List[PlanStep]] = {}
+        for step in steps:
+            key = (step.agent, self.model_router.for_agent(step.agent, step.objective, step.guidance, step_id=step.id))
+            group = open_groups.get(key)
+            if group is None or len(group) >= self.max_coalesced_steps:
+                group = []
+                open_groups[key] = group
+                groups.append(group)
+            group.append(step)
+        return groups
+
+    @staticmethod
+    def _split_coalesced(text: str, step_ids: List[str]) -> Dict[str, str]:
+        sections: Dict[str, str] = {}
+        matches = list(re.finditer(r"^#{2,4}\s*STEP\s+(\S+)\s*$", text, flags=re.MULTILINE))
+        for i, m in enumerate(matches):
+            end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+            sid = m.group(1)
+            body = text[m.end() : end].strip()
+            if sid in step_ids and body:
+                sections[sid] = body
+        return sections
+
+    def _run_step_group(
+        self,
+        state: _QueryState,
+        group: List[PlanStep],
+        query: str,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> Tuple[List[StepResult], List[PlanStep]]:
+        # Returns the finished steps and the ones a coalesced reply left out; the caller
+        # runs those as separate calls through its normal fan-out.
+        if len(group) == 1:
+            return [self._run_step(state, group[0], query, history)], []
+        first = group[0]
+        agent = self._agent_map.get(first.agent, self.researcher)
+        parts = "\n\n".join(
+            f"### STEP {s.id}\nObjective: {s.objective}\nGuidance: {s.guidance}" for s in group
+        )
+        prompt = (
+            f"User request: {query}\n\n"
+            f"Complete each of the following steps ({first.agent}) independently.\n"
+            f"Respond with one section per step. Start each section with a header line\n"
+            f"exactly of the form `### STEP <id>` and write nothing before the first header.\n\n"
+            f"{parts}"
+        )
+        primary = self.model_router.for_agent(first.agent, first.objective, first.guidance, step_id=first.id)
+        candidates = self._candidates(primary)
+        try:
+            sections = self._split_coalesced(
+                self._try_run(state, agent, prompt, candidates, history=history), [s.id for s in group]
+            )
+        except Exception:
+            sections = {}
+        results: List[StepResult] = []
+        missing: List[PlanStep] = []
+        for step in group:
+            if step.id in sections:
+                results.append(
+                    StepResult(step_id=step.id, agent=step.agent, objective=step.objective, output=sections[step.id])
+                )
+            else:
+                # Unparseable or missing section: the step needs a dedicated call.
+                missing.append(step)
+        return results, missing
+
+    def _fold_steps(self, state: _QueryState, query: str, partial: str, results: List[StepResult]) -> str:
+        outputs = "\n\n".join(f"[{r.step_id}] {r.agent} — {r.objective}:\n{r.output}" for r in results)
+        prompt = (
+            f"User request: {query}\n\n"
+            f"Current notes:\n{partial or '(none yet)'}\n\n"
+            f"New step outputs:\n{outputs}\n\n"
+            f"Fold the new step outputs into the notes."
+        )
+        condenser_model = self.model_router.for_agent("condenser")
+        candidates = self._candidates(condenser_model, *FALLBACK_MODELS)
+        return self._try_run(state, self.condenser, prompt, candidates)
+
     @staticmethod
     def _steps_context_text(step_outputs: Dict[str, StepResult]) -> str:
         lines: List[str] = []
@@ -95,26 +370,275 @@ class Cabinet:
             lines.append(f"[{sid}] {s.agent} — {s.objective}\n{s.output}\n")
         return "\n".join(lines)
 
-    @staticmethod
-    def _parse_critic_json(text: str) -> Dict[str, Any]:
-        text = text.strip()
+    def _finish_speculation(
+        self,
+        state: _QueryState,
+        prompts: QueryPrompts,
+        future: "Future[str]",
+        early: Dict[str, StepResult],
+        step_outputs: Dict[str, StepResult],
+        straggler_wait: float,
+        synth_candidates: List[str],
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        late = {sid: res for sid, res in step_outputs.items() if sid not in early}
+        info: Dict[str, Any] = {
+            "early_steps": len(early),
+            "stragglers": sorted(late),
+            "straggler_wait": round(straggler_wait, 3),
+        }
         try:
-            return json.loads(text)
+            draft = future.result()
+        except QueryCancelled:
+            raise
         except Exception:
-            start = text.find("{")
-            end = text.rfind("}")
-            if start != -1 and end != -1 and end > start:
-                try:
-                    return json.loads(text[start : end + 1])
-                except Exception:
-                    return {"quality": 3, "issues": [], "suggested_fixes": []}
-        return {"quality": 3, "issues": [], "suggested_fixes": []}
+            info["outcome"] = "failed"
+            return None, info
+        known = content_words(draft)
+        for res in early.values():
+            known |= content_words(res.output)
+        scores = {sid: round(novelty(res.output, known), 3) for sid, res in late.items()}
+        info["novelty"] = scores
+        if straggler_wait <= self.speculative_deadline and max(scores.values(), default=0.0) < self.speculative_novelty:
+            info["outcome"] = "kept"
+            return draft, info
+        # Only the late steps and the draft go out, not the whole team context again.
+        revised = self._try_run(
+            state,
+            self.synthesizer,
+            prompts.delta_revision(draft, self._steps_context_text(late)),
+            synth_candidates,
+            stage="synthesize",
+        )
+        info["outcome"] = "revised"
+        return revised, info
+
+    def _run_critic(
+        self,
+        state: _QueryState,
+        prompt: str,
+        candidates: List[str],
+        context: Optional[List[Dict[str, str]]] = None,
+    ) -> Optional[Dict[str, Any]]:
+        # A reply without JSON is retried once with a stricter instruction; None if it still fails.
+        critique = parse_critique(self._try_run(state, self.critic, prompt, candidates, history=context))
+        if critique is None:
+            strict = prompt + "\n\nReply with the JSON object only."
+            critique = parse_critique(self._try_run(state, self.critic, strict, candidates, history=context))
+        return critique
+
+    def _critique_controller(self) -> CritiqueController:
+        return CritiqueController(
+            target_quality=self.critique_target,
+            min_gain=self.critique_min_gain,
+            seconds_per_point=self.critique_seconds_per_point,
+        )
+
+    @staticmethod
+    def _split_sections(text: str, max_sections: int = 8) -> Tuple[List[str], List[str]]:
+        """Sections of `text` and the original separators between them.
+
+        Markdown headings are the boundaries, otherwise paragraphs are grouped.
+        Nothing inside a fenced code block (``` or ~~~) ever starts a section.
+        """
+        headings: List[int] = []
+        paragraphs: List[int] = []
+        fence = ""
+        seen_content = after_blank = False
+        offset = 0
+        for line in text.splitlines(keepends=True):
+            m = _FENCE.match(line)
+            if fence:
+                if m and m.group(1).startswith(fence) and not line.strip().strip(fence[0]):
+                    fence = ""
+            elif not line.strip():
+                after_blank = True
+            else:
+                if seen_content and _HEADING.match(line):
+                    headings.append(offset)
+                if seen_content and after_blank:
+                    paragraphs.append(offset)
+                after_blank = False
+                if m:
+                    fence = m.group(1)
+            seen_content = seen_content or bool(line.strip())
+            offset += len(line)
+
+        bounds = headings or paragraphs
+        if not bounds:
+            return [text], []
+        spans = list(zip([0] + bounds, bounds + [len(text)]))
+        if len(spans) > max_sections:
+            size = -(-len(spans) // max_sections)
+            spans = [(spans[i][0], spans[min(i + size, len(spans)) - 1][1]) for i in range(0, len(spans), size)]
+        cores: List[Tuple[int, int]] = []
+        for start, end in spans:
+            chunk = text[start:end]
+            cores.append((start + _LEADING_BLANK_LINES.match(chunk).end(), start + len(chunk.rstrip())))
+        parts = [text[a:b] for a, b in cores]
+        separators = [text[cores[i][1] : cores[i + 1][0]] for i in range(len(cores) - 1)]
+        return parts, separators
+
+    @staticmethod
+    def _join_sections(parts: List[str], separators: List[str]) -> str:
+        out = [parts[0]]
+        for sep, part in zip(separators, parts[1:]):
+            out += [sep, part]
+        return "".join(out)
+
+    def _review_section(
+        self,
+        state: _QueryState,
+        prompts: QueryPrompts,
+        section: str,
+        index: int,
+        total: int,
+        context: List[Dict[str, str]],
+        critic_candidates: List[str],
+        synth_candidates: List[str],
+    ) -> Tuple[str, Dict[str, Any]]:
+        critique = self._run_critic(state, prompts.section_critique(section, index, total), critic_candidates, context)
+        if critique is None:
+            return section, {"quality": None, "issues": [], "suggested_fixes": [], "parse_error": True}
+        issues = critique.get("issues", []) or []
+        quality = critique.get("quality")
+        if not issues and isinstance(quality, (int, float)) and quality >= self.critique_target:
+            return section, critique
+        fix_prompt = prompts.revise_section(critique, section, index, total)
+        return self._try_run(state, self.synthesizer, fix_prompt, synth_candidates, stage="critique").strip(), critique
+
+    def _critique_sections(
+        self,
+        state: _QueryState,
+        prompts: QueryPrompts,
+        answer: str,
+        context: List[Dict[str, str]],
+        critic_candidates: List[str],
+        synth_candidates: List[str],
+    ) -> Tuple[Optional[str], Dict[str, Any]]:
+        sections, separators = self._split_sections(answer)
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sections))) as ex:
+            futures = [
+                ex.submit(
+                    self._review_section,
+                    state,
+                    prompts,
+                    section,
+                    i,
+                    len(sections),
+                    context,
+                    critic_candidates,
+                    synth_candidates,
+                )
+                for i, section in enumerate(sections)
+            ]
+            reviewed = [f.result() for f in futures]
+
+        qualities: List[Any] = []
+        issues: List[str] = []
+        fixes: List[str] = []
+        changed = False
+        for i, (text, crit) in enumerate(reviewed):
+            qualities.append(crit.get("quality"))
+            issues.extend(f"[section {i + 1}] {x}" for x in (crit.get("issues", []) or []))
+            fixes.extend(f"[section {i + 1}] {x}" for x in (crit.get("suggested_fixes", []) or []))
+            changed = changed or text != sections[i]
+        numeric = [q for q in qualities if isinstance(q, (int, float))]
+        critique = {
+            "quality": min(numeric) if numeric else None,
+            "issues": issues,
+            "suggested_fixes": fixes,
+            "section_quality": qualities,
+        }
+        if all(crit.get("parse_error") for _, crit in reviewed):
+            critique["parse_error"] = True
+        if not changed:
+            return None, critique
+        return self._join_sections([text for text, _ in reviewed], separators), critique
 
-    def _try_run(self, agent, prompt: str, candidates: List[str]) -> str:
+    def _call(
+        self,
+        state: _QueryState,
+        fn: Callable[[], Any],
+        prompt: str = "",
+        stage: str = "",
+        role: str = "",
+        model: str = "",
+        fallback: int = 0,
+        context_chars: int = 0,
+    ) -> Any:
+        def timed() -> Any:
+            started = time.time()
+            ok = False
+            try:
+                out = fn()
+                ok = True
+                return out
+            finally:
+                # Runs on the thread that made the HTTP call, so the attempt counter is ours.
+                record = CallRecord(
+                    stage=stage,
+                    role=role,
+                    model=model,
+                    started=started,
+                    latency=time.time() - started,
+                    ok=ok,
+                    fallback=fallback,
+                    attempts=max(1, last_call_attempts()),
+                )
+                state.record(record)
+
+        token = state.token
+        token.raise_if_cancelled()
+        if self.scheduler is None:
+            return timed()
+        # Rough token estimate (4 chars/token) drives fair queueing and quotas.
+        future = self.scheduler.submit(
+            timed,
+            tenant=self.tenant or "default",
+            priority=self.priority,
+            cost_tokens=(len(prompt) + context_chars) // 4,
+        )
+        # A cancelled query drops its queued calls instead of waiting for a slot.
+        token.add_callback(future.cancel)
+        try:
+            return future.result()
+        except CancelledError:
+            raise QueryCancelled(token.reason or "cancelled")
+        finally:
+            token.remove_callback(future.cancel)
+
+    def _try_run(
+        self,
+        state: _QueryState,
+        agent,
+        prompt: str,
+        candidates: List[str],
+        stage: Optional[str] = None,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> str:
         last_err: Optional[Exception] = None
-        for m in [c for c in candidates if c]:
+        context_chars = sum(len(msg.get("content") or "") for msg in history or [])
+        for i, m in enumerate(candidates):
             try:
-                return agent.run(prompt, model_override=m)
+                return self._call(
+                    state,
+                    lambda: agent.run(
+                        prompt,
+                        history=history,
+                        model_override=m,
+                        generation=self.model_router.generation_for(agent.name),
+                        project=self.tenant,
+                        cancel_token=state.token,
+                    ),
+                    prompt,
+                    stage=stage or _STAGE_BY_ROLE.get(agent.name, agent.name),
+                    role=agent.name,
+                    model=m,
+                    fallback=i,
+                    context_chars=context_chars,
+                )
+            except QueryCancelled:
+                raise
             except ModelNotFoundError as e:
                 last_err = e
                 continue
@@ -133,29 +657,201 @@ class Cabinet:
         query: str,
         parallel: bool = True,
         max_iterations: int = 2,
+        context: Optional[TurnContext] = None,
+        cancel_token: Optional[CancellationToken] = None,
     ) -> CabinetResult:
+        result: Optional[CabinetResult] = None
+        events = self.answer_iter(
+            query, parallel=parallel, max_iterations=max_iterations, context=context, cancel_token=cancel_token
+        )
+        for event in events:
+            if isinstance(event, FinalAnswer):
+                result = event.result
+        if result is None:
+            raise RuntimeError("Cabinet finished without a final answer")
+        return result
+
+    async def answer_aiter(
+        self,
+        query: str,
+        parallel: bool = True,
+        max_iterations: int = 2,
+        context: Optional[TurnContext] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> AsyncIterator[CabinetEvent]:
+        # Drive the blocking generator from a worker thread, one event at a time.
+        token = cancel_token or CancellationToken()
+        events = self.answer_iter(
+            query, parallel=parallel, max_iterations=max_iterations, context=context, cancel_token=token
+        )
+        done = object()
+        finished = False
+        try:
+            while True:
+                event = await asyncio.to_thread(next, events, done)
+                if event is done:
+                    finished = True
+                    break
+                yield event
+        finally:
+            if not finished:
+                # Consumer went away (e.g. client disconnected): stop the query's remaining work.
+                token.cancel("consumer closed the stream")
+            try:
+                events.close()
+            except ValueError:
+                # Still running on the worker thread; it stops at its next cancellation check.
+                pass
+
+    def _iter_steps(
+        self,
+        state: _QueryState,
+        groups: List[List[PlanStep]],
+        query: str,
+        parallel: bool,
+        history: Optional[List[Dict[str, str]]] = None,
+    ) -> Iterator[CabinetEvent]:
+        remaining = sum(len(g) for g in groups)
+        if not (parallel and remaining > 1):
+            for group in groups:
+                for step in group:
+                    yield StepStarted(step_id=step.id, agent=step.agent, objective=step.objective)
+                started = time.time()
+                results, missing = self._run_step_group(state, group, query, history)
+                for res in results:
+                    yield StepFinished(result=res, duration=time.time() - started)
+                for step in missing:
+                    res = self._run_step(state, step, query, history)
+                    yield StepFinished(result=res, duration=time.time() - started)
+            return
+
+        # Workers report start/finish through a queue so events surface as they happen.
+        inbox: "queue.Queue[Any]" = queue.Queue()
+
+        def work(group: List[PlanStep], started: Optional[float] = None) -> None:
+            try:
+                if started is None:
+                    for step in group:
+                        inbox.put(StepStarted(step_id=step.id, agent=step.agent, objective=step.objective))
+                    started = time.time()
+                results, missing = self._run_step_group(state, group, query, history)
+                for res in results:
+                    inbox.put(StepFinished(result=res, duration=time.time() - started))
+                # Steps a coalesced reply left out go back to the pool as separate, concurrent calls.
+                for step in missing:
+                    ex.submit(work, [step], started)
+            except BaseException as e:
+                inbox.put(e)
+
+        def wake() -> None:
+            inbox.put(QueryCancelled(token.reason or "cancelled"))
+
+        token = state.token
+        token.add_callback(wake)
+        ex = ThreadPoolExecutor(max_workers=min(self.max_workers, remaining))
+        try:
+            for group in groups:
+                ex.submit(work, group)
+            while remaining:
+                item = inbox.get()
+                if isinstance(item, BaseException):
+                    raise item
+                if isinstance(item, StepFinished):
+                    remaining -= 1
+                yield item
+        finally:
+            token.remove_callback(wake)
+            # On error or cancel, drop steps that have not started and do not wait for running ones.
+            ex.shutdown(wait=remaining == 0, cancel_futures=True)
+
+    def answer_iter(
+        self,
+        query: str,
+        parallel: bool = True,
+        max_iterations: int = 2,
+        context: Optional[TurnContext] = None,
+        cancel_token: Optional[CancellationToken] = None,
+    ) -> Iterator[CabinetEvent]:
+        token = cancel_token or CancellationToken()
+        finished = False
+        try:
+            yield from self._answer_events(query, parallel, max_iterations, context, token)
+            finished = True
+        finally:
+            if not finished:
+                # Abandoned or failed: release whatever the query still holds.
+                token.cancel("query stopped")
+
+    def _answer_events(
+        self,
+        query: str,
+        parallel: bool,
+        max_iterations: int,
+        context: Optional[TurnContext],
+        token: CancellationToken,
+    ) -> Iterator[CabinetEvent]:
+        t0 = time.time()
+        # Follow-up turn in a session: reuse routing and prior step outputs, plan only new steps.
+        follow_up = context is not None and context.turn > 0
+        history = context.history if context is not None else None
+        prompts = QueryPrompts(query)
+        timings: Dict[str, float] = {}
+        mark = [t0]
+        state = _QueryState(token=token)
+
+        def stamp(event: CabinetEvent) -> CabinetEvent:
+            event.elapsed = event.timestamp - t0
+            return event
+
+        def lap(stage: str) -> None:
+            now = time.time()
+            timings[stage] = timings.get(stage, 0.0) + (now - mark[0])
+            mark[0] = now
+
+        if self.catalog is not None and not self.catalog.fresh:
+            self.prepare_models()
+
+        cache_ns = ""
+        if self.answer_cache is not None and not follow_up:
+            cache_ns = self._cache_namespace(max_iterations)
+            hit = self.answer_cache.get(query, cache_ns)
+            if hit is not None:
+                cached = CabinetResult.from_dict(hit[0])
+                cached.query = query
+                cached.cached = True
+                cached.calls = []
+                cached.timings = {"total": time.time() - t0}
+                yield stamp(FinalAnswer(result=cached))
+                return
+
         # 0) Decide model routing (single call) if available models provided
-        if self.available_models:
+        if self.available_models and not follow_up:
             # Try decider with its configured model; if invalid, fall back to safer choices.
-            decider_overrides = [
-                getattr(self.decider, "model", None),
-                "gpt-4o-mini",
-                "claude-3-haiku-20240307",
-                "gemini-1.5-flash-8b",
-                self.model_router.default_model,
-            ]
-            decider_overrides = [m for m in decider_overrides if m]
+            decider_overrides = self._candidates(getattr(self.decider, "model", None), *FALLBACK_MODELS)
             decision = None
             last_error: Optional[Exception] = None
-            for m in decider_overrides:
+            for fallback, m in enumerate(decider_overrides):
                 try:
-                    decision = self.decider.decide(
-                        user_request=query,
-                        allowed_models=self.available_models,
-                        routing_goal=self.routing_goal,
-                        model_override=m,
+                    decision = self._call(
+                        state,
+                        lambda: self.decider.decide(
+                            user_request=query,
+                            allowed_models=self.available_models,
+                            routing_goal=self.routing_goal,
+                            model_override=m,
+                            generation=self.model_router.generation_for("decider"),
+                            project=self.tenant,
+                            cancel_token=state.token,
+                        ),
+                        query,
+                        stage="route",
+                        role="decider",
+                        model=m,
+                        fallback=fallback,
                     )
                     break
+                except QueryCancelled:
+                    raise
                 except ModelNotFoundError:
                     last_error = None
                     continue
@@ -165,27 +861,45 @@ class Cabinet:
                 except Exception as e:
                     last_error = e
                     continue
+            decided = False
             if isinstance(decision, dict):
                 role_map = decision.get("role_models") or {}
+                if isinstance(role_map, dict) and self.catalog is not None:
+                    role_map = {k: v for k, v in role_map.items() if self.catalog.is_available(str(v))}
                 if isinstance(role_map, dict) and role_map:
                     self.model_router.set_role_map(role_map)
+                    decided = True
             # If still no decision, proceed with existing router map
+            lap("route")
+            yield stamp(RoutingDecided(role_models=dict(self.model_router.agent_models), decided=decided))
 
         # 1) Plan
         plan_model = self.model_router.for_agent("planner", query)
-        plan_candidates = [
-            plan_model,
-            self.model_router.default_model,
-            "gpt-4o-mini",
-            "claude-3-haiku-20240307",
-            "gemini-1.5-flash-8b",
-        ]
+        plan_candidates = self._candidates(plan_model)
         plan = None
         last_err: Optional[Exception] = None
-        for m in [c for c in plan_candidates if c]:
+        for fallback, m in enumerate(plan_candidates):
             try:
-                plan = self.planner.plan(query, model_override=m)
+                plan = self._call(
+                    state,
+                    lambda: self.planner.plan(
+                        query,
+                        history=history,
+                        prior_steps=list(context.prior_steps.values()) if follow_up else None,
+                        model_override=m,
+                        generation=self.model_router.generation_for("planner"),
+                        project=self.tenant,
+                        cancel_token=state.token,
+                    ),
+                    query,
+                    stage="plan",
+                    role="planner",
+                    model=m,
+                    fallback=fallback,
+                )
                 break
+            except QueryCancelled:
+                raise
             except ModelNotFoundError as e:
                 last_err = e
                 continue
@@ -199,76 +913,172 @@ class Cabinet:
             if last_err:
                 raise last_err
             raise RuntimeError("Planner could not be run with any candidate model")
+        if follow_up:
+            # Keep new step ids distinct from the ones being reused.
+            for step in plan.steps:
+                step.id = f"t{context.turn + 1}-{step.id}"
+        lap("plan")
+        yield stamp(PlanReady(plan=plan))
 
         # 2) Execute steps
-        step_outputs: Dict[str, StepResult] = {}
-        if parallel and len(plan.steps) > 1:
-            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(plan.steps))) as ex:
-                future_map = {ex.submit(self._run_step, step, query): step.id for step in plan.steps}
-                for fut in as_completed(future_map):
-                    res = fut.result()
+        step_outputs: Dict[str, StepResult] = dict(context.prior_steps) if follow_up else {}
+        folder: Optional[ProgressiveSynthesizer] = None
+        if self.progressive_synthesis:
+            folder = ProgressiveSynthesizer(
+                lambda partial, results: self._fold_steps(state, query, partial, results),
+                initial=context.prior_context if follow_up else "",
+            )
+
+        def team_context_text(outputs: Dict[str, StepResult]) -> str:
+            if follow_up and context.prior_context:
+                fresh = {k: v for k, v in outputs.items() if k not in context.prior_steps}
+                return (context.prior_context + "\n\n" + self._steps_context_text(fresh)).strip()
+            return self._steps_context_text(outputs)
+
+        synth_model = self.model_router.for_agent("synthesizer")
+        synth_candidates = self._candidates(synth_model)
+
+        # Speculative pre-draft: synthesize from the early steps while stragglers run.
+        speculate_after: Optional[int] = None
+        if self.speculative_fraction is not None and folder is None and len(plan.steps) > 1:
+            speculate_after = max(1, math.ceil(self.speculative_fraction * len(plan.steps)))
+            if speculate_after >= len(plan.steps):
+                speculate_after = None
+        spec_pool: Optional[ThreadPoolExecutor] = None
+        spec_future: Optional["Future[str]"] = None
+        spec_early: Dict[str, StepResult] = {}
+        spec_started = 0.0
+        finished_steps = 0
+        last_finished = 0.0
+
+        groups = self._group_steps(plan.steps)
+        try:
+            for event in self._iter_steps(state, groups, query, parallel, history):
+                if isinstance(event, StepFinished):
+                    res = event.result
                     step_outputs[res.step_id] = res
                     self.blackboard.record_step(res)
-        else:
-            for step in plan.steps:
-                res = self._run_step(step, query)
-                step_outputs[res.step_id] = res
-                self.blackboard.record_step(res)
+                    if folder is not None:
+                        folder.add(res)
+                    finished_steps += 1
+                    last_finished = time.time()
+                    if speculate_after is not None and spec_future is None and finished_steps >= speculate_after:
+                        spec_early = dict(step_outputs)
+                        early_text = team_context_text(spec_early)
+                        spec_started = last_finished
+                        spec_pool = ThreadPoolExecutor(max_workers=1)
+                        spec_future = spec_pool.submit(
+                            self._try_run,
+                            state,
+                            self.synthesizer,
+                            prompts.synthesize(),
+                            synth_candidates,
+                            history=prompts.with_context(early_text, history),
+                        )
+                yield stamp(event)
+        except BaseException:
+            if spec_pool is not None:
+                spec_pool.shutdown(wait=False, cancel_futures=True)
+            if folder is not None:
+                folder.cancel()
+            raise
+
+        lap("steps")
 
         # 3) Synthesize
-        context_text = self._steps_context_text(step_outputs)
-        synth_prompt = (
-            f"User request: {query}\n\n"
-            f"Context from team steps below. Produce a cohesive final answer.\n\n"
-            f"{context_text}"
-        )
-        synth_model = self.model_router.for_agent("synthesizer")
-        synth_candidates = [
-            synth_model,
-            self.model_router.default_model,
-            "gpt-4o-mini",
-            "claude-3-haiku-20240307",
-            "gemini-1.5-flash-8b",
-        ]
-        draft_answer = self._try_run(self.synthesizer, synth_prompt, synth_candidates)
+        if folder is not None:
+            context_text = folder.result()
+        else:
+            context_text = team_context_text(step_outputs)
+        # The team context is one shared message reused by the synthesizer and every critic call.
+        team_context = prompts.with_context(context_text)
+        speculation: Optional[Dict[str, Any]] = None
+        draft_answer: Optional[str] = None
+        if spec_future is not None:
+            try:
+                draft_answer, speculation = self._finish_speculation(
+                    state,
+                    prompts,
+                    spec_future,
+                    spec_early,
+                    step_outputs,
+                    last_finished - spec_started,
+                    synth_candidates,
+                )
+            finally:
+                spec_pool.shutdown(wait=False)
+        if draft_answer is None:
+            draft_answer = self._try_run(
+                state,
+                self.synthesizer,
+                prompts.synthesize(condensed=folder is not None),
+                synth_candidates,
+                history=prompts.with_context(context_text, history),
+            )
+        lap("synthesize")
+        yield stamp(DraftReady(draft=draft_answer))
 
         # 4) Critique & iterate
         final_answer = draft_answer
         critique_dict: Optional[Dict[str, Any]] = None
         iterations = 1
+        controller = self._critique_controller()
+        reviewed: List[str] = []
+        stop_reason = MAX_ITERATIONS
+        # Until a revision has been timed, the draft synthesis estimates its latency.
+        revise_seconds = timings.get("synthesize", 0.0)
+        critic_candidates = self._candidates(self.model_router.for_agent("critic"))
         for i in range(max_iterations - 1):
-            crit_prompt = (
-                f"User request: {query}\n\n"
-                f"Proposed final answer:\n{final_answer}\n\n"
-                f"Team context:\n{context_text}"
-            )
-            critic_model = self.model_router.for_agent("critic")
-            critic_candidates = [
-                critic_model,
-                self.model_router.default_model,
-                "gpt-4o-mini",
-                "claude-3-haiku-20240307",
-                "gemini-1.5-flash-8b",
-            ]
-            critique_text = self._try_run(self.critic, crit_prompt, critic_candidates)
-            critique = self._parse_critic_json(critique_text)
-            critique_dict = critique
-            issues = critique.get("issues", []) or []
-            quality = critique.get("quality", 3)
-
-            if not issues and quality >= 4:
-                break
+            round_start = time.time()
+            revised: Optional[str] = None
+            if self.section_critique:
+                revised, critique_dict = self._critique_sections(
+                    state,
+                    prompts, final_answer, team_context, critic_candidates, synth_candidates
+                )
+                critique = None if critique_dict.get("parse_error") else critique_dict
+            else:
+                critique = self._run_critic(state, prompts.critique(final_answer), critic_candidates, team_context)
+                critique_dict = critique or {"quality": None, "issues": [], "suggested_fixes": [], "parse_error": True}
+            reviewed.append(final_answer)
+            round_ = controller.observe(critique, expected_seconds=revise_seconds)
 
-            fix_prompt = (
-                f"User request: {query}\n\n"
-                f"Improve the final answer based on this critique:\n"
-                f"quality={quality}, issues={issues}, suggested_fixes={critique.get('suggested_fixes', [])}\n\n"
-                f"Current answer:\n{final_answer}"
+            if round_.decision == REGRESSED:
+                # The last revision made things worse; go back to the best-scored answer.
+                final_answer = reviewed[controller.best_iteration() - 1]
+                revised = None
+            elif self.section_critique and revised is not None and round_.decision != UNPARSEABLE:
+                # Sections are rewritten alongside their review, so the revision is already paid for.
+                final_answer = revised
+                iterations += 1
+            elif round_.decision == REVISE:
+                fix_start = time.time()
+                revised = self._try_run(
+                    state,
+                    self.synthesizer,
+                    prompts.revise(critique_dict, final_answer),
+                    synth_candidates,
+                    stage="critique",
+                )
+                revise_seconds = time.time() - fix_start
+                final_answer = revised
+                iterations += 1
+            round_.seconds = time.time() - round_start
+            yield stamp(
+                CritiqueReady(iteration=i + 1, critique=critique_dict, revised=revised, decision=round_.decision)
             )
-            final_answer = self._try_run(self.synthesizer, fix_prompt, synth_candidates)
-            iterations += 1
+            if round_.decision != REVISE:
+                stop_reason = round_.decision
+                break
+            if self.section_critique and revised is None:
+                stop_reason = PLATEAU
+                break
 
-        return CabinetResult(
+        lap("critique")
+        timings["total"] = time.time() - t0
+        with state.lock:
+            calls = list(state.calls)
+        result = CabinetResult(
             query=query,
             plan=plan,
             step_outputs=step_outputs,
@@ -276,4 +1086,19 @@ class Cabinet:
             final_answer=final_answer,
             critique=critique_dict,
             iterations=iterations,
+            timings=timings,
+            calls=calls,
+            context_text=context_text,
+            critique_rounds=list(controller.rounds),
+            stop_reason=stop_reason if max_iterations > 1 else "",
+            speculation=speculation,
         )
+        if self.history is not None:
+            try:
+                self.history.record(result)
+            except Exception:
+                pass
+        if self.answer_cache is not None and cache_ns:
+            # Follow-up turns depend on the session's context, so they are never stored.
+            self.answer_cache.put(query, cache_ns, result.to_dict())
+        yield stamp(FinalAnswer(result=result))
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+
+from .api_client import EncodedMessage
+
+
+class QueryPrompts:
+    """Prompt templates for one query, built once and reused by every call.
+
+    The team context travels as its own message. All synthesizer and critic
+    calls for the query share that message object, which keeps its encoding,
+    so the context is serialized once per query and only the short per-call
+    prompt changes.
+    """
+
+    def __init__(self, query: str) -> None:
+        self.query = query
+        self.request = f"User request: {query}\n\n"
+        self._context_text: Optional[str] = None
+        self._context_message: Dict[str, str] = EncodedMessage()
+
+    def context_message(self, context_text: str) -> Dict[str, str]:
+        if context_text != self._context_text:
+            self._context_text = context_text
+            self._context_message = EncodedMessage(role="user", content="Team context:\n" + context_text)
+        return self._context_message
+
+    def with_context(self, context_text: str, history: Optional[List[Dict[str, str]]] = None) -> List[Dict[str, str]]:
+        return list(history or []) + [self.context_message(context_text)]
+
+    def synthesize(self, condensed: bool = False) -> str:
+        source = "Condensed notes from team steps are" if condensed else "Context from team steps is"
+        return self.request + source + " in the previous message. Produce a cohesive final answer."
+
+    def critique(self, answer: str) -> str:
+        return (
+            self.request
+            + "Proposed final answer:\n"
+            + answer
+            + "\n\nJudge it against the team context in the previous message."
+        )
+
+    def section_critique(self, section: str, index: int, total: int) -> str:
+        return (
+            self.request
+            + f"Review only section {index + 1} of {total} of the proposed final answer:\n"
+            + section
+            + "\n\nJudge it against the team context in the previous message."
+        )
+
+    def delta_revision(self, draft: str, late_steps: str) -> str:
+        return (
+            self.request
+            + "The draft answer below was written before these team steps finished. "
+            + "Integrate any new facts or corrections from them and keep the rest of the draft as is. "
+            + "Return the full revised answer.\n\nLate steps:\n"
+            + late_steps
+            + "\n\nDraft answer:\n"
+            + draft
+        )
+
+    @staticmethod
+    def _critique_line(critique: Dict[str, Any]) -> str:
+        return (
+            f"quality={critique.get('quality')}, issues={critique.get('issues', []) or []}, "
+            f"suggested_fixes={critique.get('suggested_fixes', [])}"
+        )
+
+    def revise(self, critique: Dict[str, Any], answer: str) -> str:
+        return (
+            self.request
+            + "Improve the final answer based on this critique:\n"
+            + self._critique_line(critique)
+            + "\n\nCurrent answer:\n"
+            + answer
+        )
+
+    def revise_section(self, critique: Dict[str, Any], section: str, index: int, total: int) -> str:
+        return (
+            self.request
+            + f"Rewrite only this section ({index + 1} of {total}) of the final answer based on this critique:\n"
+            + self._critique_line(critique)
+            + "\nKeep its heading and return the revised section only.\n\nCurrent section:\n"
+            + section
+        )
@@ -0,0 +1,259 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITY_CLASSES = (INTERACTIVE, BATCH)
+
+
+@dataclass
+class TenantQuota:
+    weight: float = 1.0
+    max_concurrency: Optional[int] = None
+    tokens_per_minute: Optional[int] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TenantQuota":
+        return cls(
+            weight=float(data.get("weight", 1.0)) or 1.0,
+            max_concurrency=int(data["max_concurrency"]) if data.get("max_concurrency") else None,
+            tokens_per_minute=int(data["tokens_per_minute"]) if data.get("tokens_per_minute") else None,
+        )
+
+
+@dataclass
+class _Task:
+    fn: Callable[[], Any]
+    future: Future
+    tenant: str
+    priority: str
+    cost: int
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _TenantState:
+    quota: TenantQuota
+    queues: Dict[str, Deque[_Task]] = field(default_factory=lambda: {c: deque() for c in PRIORITY_CLASSES})
+    vtime: float = 0.0
+    in_flight: int = 0
+    tokens: float = 0.0
+    refilled: float = field(default_factory=time.monotonic)
+    tokens_used: int = 0
+
+    def refill(self, now: float) -> None:
+        tpm = self.quota.tokens_per_minute
+        if tpm is None:
+            return
+        self.tokens = min(float(tpm), self.tokens + (now - self.refilled) * tpm / 60.0)
+        self.refilled = now
+
+    def eligible(self, cost: int) -> bool:
+        if self.quota.max_concurrency is not None and self.in_flight >= self.quota.max_concurrency:
+            return False
+        if self.quota.tokens_per_minute is not None:
+            # A request larger than the whole bucket may run once the bucket is full.
+            need = min(cost, self.quota.tokens_per_minute)
+            return self.tokens >= need
+        return True
+
+
+class LlmScheduler:
+    """Process-wide queue for LLM calls.
+
+    Interactive work is always dispatched before batch work, except that batch
+    tasks waiting longer than `batch_max_wait` seconds are promoted. Within a
+    class, tenants share capacity by weighted fair queueing on estimated tokens,
+    subject to each tenant's concurrency and tokens-per-minute quota.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        quotas: Optional[Dict[str, TenantQuota]] = None,
+        default_quota: Optional[TenantQuota] = None,
+        batch_max_wait: float = 30.0,
+        wait_samples: int = 2048,
+    ) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.default_quota = default_quota or TenantQuota()
+        self.batch_max_wait = float(batch_max_wait)
+        self._quotas: Dict[str, TenantQuota] = dict(quotas or {})
+        self._tenants: Dict[str, _TenantState] = {}
+        self._waits: Dict[str, Deque[float]] = {c: deque(maxlen=wait_samples) for c in PRIORITY_CLASSES}
+        self._dispatched: Dict[str, int] = {c: 0 for c in PRIORITY_CLASSES}
+        self._cond = threading.Condition()
+        self._closed = False
+        self._workers: List[threading.Thread] = []
+        for i in range(self.max_concurrency):
+            t = threading.Thread(target=self._worker, name=f"cabinet-scheduler-{i}", daemon=True)
+            t.start()
+            self._workers.append(t)
+
+    def set_quota(self, tenant: str, quota: TenantQuota) -> None:
+        with self._cond:
+            self._quotas[tenant] = quota
+            if tenant in self._tenants:
+                self._tenants[tenant].quota = quota
+            self._cond.notify_all()
+
+    def _tenant(self, name: str) -> _TenantState:
+        state = self._tenants.get(name)
+        if state is None:
+            quota = self._quotas.get(name, self.default_quota)
+            state = _TenantState(quota=quota, tokens=float(quota.tokens_per_minute or 0))
+            self._tenants[name] = state
+        return state
+
+    def submit(
+        self,
+        fn: Callable[[], Any],
+        tenant: str = "default",
+        priority: str = INTERACTIVE,
+        cost_tokens: int = 0,
+    ) -> Future:
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        fut: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Scheduler is shut down")
+            state = self._tenant(tenant)
+            if not any(state.queues[c] for c in PRIORITY_CLASSES) and state.in_flight == 0:
+                # A tenant returning from idle starts at the current virtual time, not with banked credit.
+                active = [t.vtime for t in self._tenants.values() if t is not state and (t.in_flight or any(t.queues.values()))]
+                state.vtime = max(state.vtime, min(active) if active else 0.0)
+            state.queues[priority].append(_Task(fn, fut, tenant, priority, max(1, int(cost_tokens))))
+            self._cond.notify()
+        return fut
+
+    def run(self, fn: Callable[[], Any], tenant: str = "default", priority: str = INTERACTIVE, cost_tokens: int = 0) -> Any:
+        return self.submit(fn, tenant=tenant, priority=priority, cost_tokens=cost_tokens).result()
+
+    def _pick(self, now: float) -> Optional[_Task]:
+        classes = list(PRIORITY_CLASSES)
+        starving = any(
+            t.queues[BATCH] and t.queues[BATCH][0].enqueued + self.batch_max_wait <= now
+            for t in self._tenants.values()
+        )
+        if starving:
+            classes = [BATCH, INTERACTIVE]
+        for cls in classes:
+            best: Optional[_TenantState] = None
+            for state in self._tenants.values():
+                q = state.queues[cls]
+                # Calls cancelled while queued are dropped without charging the tenant.
+                while q and q[0].future.cancelled():
+                    q.popleft()
+                if not q:
+                    continue
+                state.refill(now)
+                if not state.eligible(q[0].cost):
+                    continue
+                if best is None or state.vtime < best.vtime:
+                    best = state
+            if best is not None:
+                task = best.queues[cls].popleft()
+                best.vtime += task.cost / best.quota.weight
+                best.in_flight += 1
+                if best.quota.tokens_per_minute is not None:
+                    best.tokens = max(0.0, best.tokens - task.cost)
+                best.tokens_used += task.cost
+                self._waits[cls].append(now - task.enqueued)
+                self._dispatched[cls] += 1
+                return task
+        return None
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                task = None
+                while task is None:
+                    if self._closed:
+                        return
+                    task = self._pick(time.monotonic())
+                    if task is None:
+                        # Tasks held back by a token quota need periodic wakeups to see the refill.
+                        queued = any(q for t in self._tenants.values() for q in t.queues.values())
+                        self._cond.wait(timeout=0.5 if queued else None)
+            if task.future.set_running_or_notify_cancel():
+                try:
+                    task.future.set_result(task.fn())
+                except BaseException as e:
+                    task.future.set_exception(e)
+            with self._cond:
+                self._tenants[task.tenant].in_flight -= 1
+                self._cond.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            classes: Dict[str, Any] = {}
+            for cls in PRIORITY_CLASSES:
+                waits = sorted(self._waits[cls])
+                queued = sum(len(t.queues[cls]) for t in self._tenants.values())
+                classes[cls] = {
+                    "dispatched": self._dispatched[cls],
+                    "queued": queued,
+                    "wait_mean": (sum(waits) / len(waits)) if waits else 0.0,
+                    "wait_p50": waits[int(0.5 * (len(waits) - 1))] if waits else 0.0,
+                    "wait_p95": waits[int(0.95 * (len(waits) - 1))] if waits else 0.0,
+                    "wait_max": waits[-1] if waits else 0.0,
+                }
+            tenants = {
+                name: {
+                    "in_flight": t.in_flight,
+                    "queued": sum(len(q) for q in t.queues.values()),
+                    "tokens_used": t.tokens_used,
+                }
+                for name, t in self._tenants.items()
+            }
+            return {"classes": classes, "tenants": tenants}
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._cond:
+            self._closed = True
+            pending = [task for t in self._tenants.values() for q in t.queues.values() for task in q]
+            for t in self._tenants.values():
+                for q in t.queues.values():
+                    q.clear()
+            self._cond.notify_all()
+        for task in pending:
+            task.future.cancel()
+        if wait:
+            for t in self._workers:
+                t.join()
+
+
+_scheduler: Optional[LlmScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def _load_quotas_from_env() -> Dict[str, TenantQuota]:
+    raw = os.environ.get("CABINET_TENANT_QUOTAS")
+    if not raw:
+        return {}
+    try:
+        data = json.loads(raw)
+        return {str(k): TenantQuota.from_dict(v) for k, v in data.items() if isinstance(v, dict)}
+    except Exception:
+        return {}
+
+
+def get_scheduler() -> LlmScheduler:
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = LlmScheduler(
+                max_concurrency=int(os.environ.get("CABINET_SCHEDULER_CONCURRENCY", "8")),
+                quotas=_load_quotas_from_env(),
+            )
+        return _scheduler
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
+
+from .blackboard import StepResult
+from .events import CabinetEvent, FinalAnswer
+from .messages import ChatHistory
+
+if TYPE_CHECKING:
+    from .orchestrator import Cabinet, CabinetResult
+
+
+@dataclass
+class TurnContext:
+    turn: int = 0
+    history: List[Dict[str, str]] = field(default_factory=list)
+    prior_steps: Dict[str, StepResult] = field(default_factory=dict)
+    prior_context: str = ""
+
+
+class CabinetSession:
+    """Multi-turn conversation over one Cabinet.
+
+    Follow-up questions reuse routing, every earlier step output and the team
+    context; the planner only adds steps the new question needs, and agents
+    see a compacted ChatHistory of earlier questions and answers.
+    """
+
+    def __init__(
+        self,
+        cabinet: "Cabinet",
+        max_history_chars: int = 6000,
+        max_message_chars: int = 1500,
+    ) -> None:
+        self.cabinet = cabinet
+        self.max_history_chars = max_history_chars
+        self.max_message_chars = max_message_chars
+        self.history = ChatHistory()
+        self.turns: List["CabinetResult"] = []
+
+    def context(self) -> TurnContext:
+        last = self.turns[-1] if self.turns else None
+        return TurnContext(
+            turn=len(self.turns),
+            history=self.history.compacted(self.max_history_chars, self.max_message_chars),
+            prior_steps=dict(last.step_outputs) if last else {},
+            prior_context=last.context_text if last else "",
+        )
+
+    def ask_iter(self, query: str, parallel: bool = True, max_iterations: int = 2) -> Iterator[CabinetEvent]:
+        for event in self.cabinet.answer_iter(
+            query, parallel=parallel, max_iterations=max_iterations, context=self.context()
+        ):
+            if isinstance(event, FinalAnswer):
+                self._record(query, event.result)
+            yield event
+
+    def ask(self, query: str, parallel: bool = True, max_iterations: int = 2) -> "CabinetResult":
+        result: Optional["CabinetResult"] = None
+        for event in self.ask_iter(query, parallel=parallel, max_iterations=max_iterations):
+            if isinstance(event, FinalAnswer):
+                result = event.result
+        if result is None:
+            raise RuntimeError("Cabinet finished without a final answer")
+        return result
+
+    def _record(self, query: str, result: "CabinetResult") -> None:
+        self.turns.append(result)
+        self.history.add("user", query)
+        self.history.add("assistant", result.final_answer)
+
+    def reset(self) -> None:
+        self.history = ChatHistory()
+        self.turns = []
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Set
+
+from .blackboard import StepResult
+
+
+FoldFn = Callable[[str, List[StepResult]], str]
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9_\-]{3,}")
+
+
+def content_words(text: str) -> Set[str]:
+    # Lowercase words of 4+ characters; short function words carry no signal.
+    return set(_WORD.findall(text.lower()))
+
+
+def novelty(text: str, known: Iterable[str]) -> float:
+    """Share of `text`'s content words that do not occur in `known`."""
+    words = content_words(text)
+    if not words:
+        return 0.0
+    known_set = known if isinstance(known, set) else set(known)
+    return len(words - known_set) / len(words)
+
+
+def _raw_block(res: StepResult) -> str:
+    return f"[{res.step_id}] {res.agent} — {res.objective}\n{res.output}\n"
+
+
+class ProgressiveSynthesizer:
+    """Fold step results into a running partial synthesis as they complete.
+
+    One fold runs at a time on a private worker so folds overlap with the
+    remaining steps. Results that finish while a fold is in flight are folded
+    together by the next call, so a burst of steps costs one fold instead of a
+    queue of them; `result()` waits only for the folds still in flight.
+    """
+
+    def __init__(self, fold: FoldFn, initial: str = "") -> None:
+        self._fold = fold
+        self._partial = initial
+        self._folded: List[str] = []
+        self._pending: List[StepResult] = []
+        self._lock = threading.Lock()
+        self._draining = False
+        self._stopped = False
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def add(self, res: StepResult) -> None:
+        with self._lock:
+            if self._stopped:
+                return
+            self._pending.append(res)
+            if self._draining:
+                return
+            self._draining = True
+        self._executor.submit(self._drain)
+
+    def _drain(self) -> None:
+        while True:
+            with self._lock:
+                batch, self._pending = self._pending, []
+                if not batch or self._stopped:
+                    self._draining = False
+                    return
+            self._apply(batch)
+
+    def _apply(self, batch: List[StepResult]) -> None:
+        try:
+            updated = self._fold(self._partial, batch)
+        except Exception:
+            updated = ""
+        if updated and updated.strip():
+            self._partial = updated.strip()
+        else:
+            # Never drop a step: keep the raw outputs if the fold failed.
+            self._partial = (self._partial + "\n\n" + "\n".join(_raw_block(r) for r in batch)).strip()
+        self._folded.extend(r.step_id for r in batch)
+
+    @property
+    def folded_steps(self) -> List[str]:
+        return list(self._folded)
+
+    def cancel(self) -> None:
+        # The query failed or was cancelled: drop pending results and start no more folds.
+        with self._lock:
+            self._stopped = True
+            self._pending = []
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def result(self) -> str:
+        self._executor.shutdown(wait=True)
+        return self._partial
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import socket
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from .blackboard import Blackboard
+from .cancellation import CancellationToken
+from .jobqueue import Job, JobQueue, SQLiteJobQueue
+from .orchestrator import Cabinet
+
+
+class _Heartbeat(threading.Thread):
+    # Extends the lease while a job runs; a dead worker stops extending and the job reappears.
+    # Losing the lease cancels the job's query, since another worker now owns it.
+    def __init__(self, queue: JobQueue, job: Job, visibility_timeout: float, token: CancellationToken) -> None:
+        super().__init__(name=f"lease-{job.id[:8]}", daemon=True)
+        self.queue = queue
+        self.job = job
+        self.visibility_timeout = visibility_timeout
+        self.token = token
+        self.lost = False
+        self._halt = threading.Event()
+
+    def run(self) -> None:
+        interval = max(0.5, self.visibility_timeout / 3.0)
+        while not self._halt.wait(interval):
+            try:
+                if not self.queue.heartbeat(self.job, self.visibility_timeout):
+                    self.lost = True
+                    self.token.cancel("lease lost")
+                    return
+            except Exception:
+                continue
+
+    def stop(self) -> None:
+        self._halt.set()
+        self.join()
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{threading.get_ident()}"
+
+
+def run_worker(
+    queue: JobQueue,
+    make_cabinet: Callable[[], Cabinet],
+    worker_id: Optional[str] = None,
+    visibility_timeout: float = 300.0,
+    poll_interval: float = 1.0,
+    max_jobs: Optional[int] = None,
+    idle_exit: Optional[float] = None,
+    stop: Optional[threading.Event] = None,
+) -> int:
+    """Lease jobs and answer them until stopped; returns the number of jobs finished."""
+    worker_id = worker_id or default_worker_id()
+    stop = stop or threading.Event()
+    cabinet = make_cabinet()
+    done = 0
+    idle_since = time.monotonic()
+    while not stop.is_set() and (max_jobs is None or done < max_jobs):
+        job = queue.lease(worker_id, visibility_timeout)
+        if job is None:
+            if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                break
+            stop.wait(poll_interval)
+            continue
+        token = CancellationToken()
+        heartbeat = _Heartbeat(queue, job, visibility_timeout, token)
+        heartbeat.start()
+        try:
+            # Fresh blackboard per job so a long-lived worker does not accumulate step outputs.
+            cabinet.blackboard = Blackboard()
+            result = cabinet.answer(
+                job.query,
+                parallel=bool(job.params.get("parallel", True)),
+                max_iterations=int(job.params.get("max_iterations", 2)),
+                cancel_token=token,
+            )
+        except Exception as e:
+            heartbeat.stop()
+            queue.fail(job, f"{type(e).__name__}: {e}")
+        else:
+            heartbeat.stop()
+            queue.complete(job, result.to_dict())
+        done += 1
+        idle_since = time.monotonic()
+    return done
+
+
+def _process_main(queue_path: str, cabinet_kwargs: Dict[str, Any], worker_kwargs: Dict[str, Any]) -> None:
+    queue = SQLiteJobQueue(queue_path)
+    run_worker(queue, lambda: Cabinet(**cabinet_kwargs), **worker_kwargs)
+
+
+def run_worker_processes(
+    queue_path: str,
+    processes: int,
+    cabinet_kwargs: Dict[str, Any],
+    **worker_kwargs: Any,
+) -> None:
+    # Each process opens its own SQLite connection; the file is the only shared state.
+    procs: List[multiprocessing.Process] = []
+    for i in range(max(1, int(processes))):
+        p = multiprocessing.Process(
+            target=_process_main,
+            args=(queue_path, cabinet_kwargs, worker_kwargs),
+            name=f"cabinet-worker-{i}",
+        )
+        p.start()
+        procs.append(p)
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.join()